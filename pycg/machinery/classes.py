@@ -64,12 +64,22 @@ class ClassNode:
                     self.mro.append(item)
         self.fix_mro()
 
+    def add_parents(self, parents):
+        # same as calling add_parent for every item, but the
+        # MRO is only fixed once at the end
+        self.mro.extend(parents)
+        self.fix_mro()
+
     def fix_mro(self):
+        # keep the last occurrence of each item
+        seen = set()
         new_mro = []
-        for idx, item in enumerate(self.mro):
-            if self.mro[idx+1:].count(item) > 0:
+        for item in reversed(self.mro):
+            if item in seen:
                 continue
+            seen.add(item)
             new_mro.append(item)
+        new_mro.reverse()
         self.mro = new_mro
 
     def get_mro(self):
@@ -79,14 +89,7 @@ class ClassNode:
         return self.module
 
     def compute_mro(self):
-        res = []
-        self.mro.reverse()
-        for parent in self.mro:
-            if not parent in res:
-                res.append(parent)
-
-        res.reverse()
-        self.mro = res
+        self.fix_mro()
 
     def clear_mro(self):
         self.mro = [self.ns]
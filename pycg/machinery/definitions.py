@@ -20,7 +20,7 @@
 #
 import logging
 
-from pycg.machinery.pointers import NamePointer, LiteralPointer
+from pycg.machinery.pointers import Pointer, NamePointer, LiteralPointer
 from pycg import utils
 
 logger = logging.getLogger(__name__)
@@ -29,6 +29,11 @@ logger = logging.getLogger(__name__)
 class DefinitionManager(object):
     def __init__(self):
         self.defs = {}
+        # bumped whenever a definition is added or replaced
+        self.generation = 0
+        # cached transitive closure and the state version it was built at
+        self.closured = None
+        self.closured_version = None
 
     def create(self, ns, def_type):
         if not ns or not isinstance(ns, str):
@@ -38,10 +43,33 @@ class DefinitionManager(object):
         if self.get(ns):
             raise DefinitionError("Definition already exists")
 
+        self.generation += 1
         self.defs[ns] = Definition(ns, def_type)
         return self.defs[ns]
 
+    def get_or_create(self, ns, def_type):
+        defi = self.defs.get(ns)
+        if defi is None:
+            defi = self.create(ns, def_type)
+        return defi
+
+    def get_or_create_many(self, nss, def_type):
+        # returns the definitions for all namespaces in nss, creating
+        # the ones that are missing with def_type
+        if not def_type in Definition.types:
+            raise DefinitionError("Invalid def type argument")
+        defs = self.defs
+        res = []
+        for ns in nss:
+            defi = defs.get(ns)
+            if defi is None:
+                defi = defs[ns] = Definition(ns, def_type)
+                self.generation += 1
+            res.append(defi)
+        return res
+
     def assign(self, ns, defi):
+        self.generation += 1
         self.defs[ns] = Definition(ns, defi.get_type())
         self.defs[ns].merge(defi)
 
@@ -55,8 +83,8 @@ class DefinitionManager(object):
         return self.defs[ns]
 
     def get(self, ns):
-        if ns in self.defs:
-            return self.defs[ns]
+        # a single probe, misses are the common case
+        return self.defs.get(ns)
 
     def get_defs(self):
         return self.defs
@@ -82,35 +110,70 @@ class DefinitionManager(object):
 
         return defi
 
-    def transitive_closure(self):
-        closured = {}
-        def dfs(defi):
+    def get_version(self):
+        # changes whenever the transitive closure may have changed:
+        # definitions are added or replaced or a pointer gains values
+        return (self.generation, Pointer.version)
+
+    def closure_of(self, defi, closured):
+        # the names defi transitively points to, memoized in closured.
+        # Pointer chains can be deeper than the recursion limit, so the
+        # depth first search keeps its own stack. Each frame holds the
+        # set being built, the names left to go through and the name
+        # whose closure is currently being computed
+        res = closured.get(defi.get_ns(), None)
+        if res is not None:
+            return res
+
+        defs = self.defs
+
+        def enter(d):
+            values = d.get_name_pointer().get()
             # bottom
-            if not closured.get(defi.get_ns(), None) == None:
-                return closured[defi.get_ns()]
-            name_pointer = defi.get_name_pointer()
-            new_set = set()
-
-            if not name_pointer.get():
-                new_set.add(defi.get_ns())
-
-            closured[defi.get_ns()] = new_set
-
-            for name in name_pointer.get():
-                if not self.defs.get(name, None):
+            new_set = set() if values else {d.get_ns()}
+            closured[d.get_ns()] = new_set
+            return [new_set, iter(values), None]
+
+        stack = [enter(defi)]
+        while True:
+            frame = stack[-1]
+            new_set, names = frame[0], frame[1]
+            for name in names:
+                child = defs.get(name, None)
+                if not child:
                     continue
-                items = dfs(self.defs[name])
+                items = closured.get(child.get_ns(), None)
+                if items is None:
+                    frame[2] = name
+                    stack.append(enter(child))
+                    break
                 if not items:
                     items = set([name])
                 new_set.update(items)
+            else:
+                stack.pop()
+                if not stack:
+                    return new_set
+                parent = stack[-1]
+                items = new_set
+                if not items:
+                    items = set([parent[2]])
+                parent[0].update(items)
 
-            closured[defi.get_ns()] = new_set
-            return closured[defi.get_ns()]
+    def transitive_closure(self):
+        # reuse the closure until the definitions change.
+        # callers must treat the returned dict as read only
+        version = self.get_version()
+        if self.closured is not None and self.closured_version == version:
+            return self.closured
 
+        closured = {}
         for ns, current_def in self.defs.items():
             if closured.get(current_def, None) == None:
-                dfs(current_def)
+                self.closure_of(current_def, closured)
 
+        self.closured = closured
+        self.closured_version = version
         return closured
 
     def complete_definitions(self):
@@ -147,7 +210,7 @@ class DefinitionManager(object):
                     pointsto_arg_def.add(item)
             return changed_something
 
-        logger.info("Def-Iterating %d defs"%(len(self.defs)))
+        logger.info("Def-Iterating %d defs", len(self.defs))
         if len(self.defs) > 9000:
             logger.info("The definition list is too large. This is likely to take forever. Avoid this step")
             return
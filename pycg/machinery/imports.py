@@ -38,10 +38,10 @@ def get_custom_loader(ig_obj):
         def __init__(self, fullname, path):
             self.fullname = fullname
             self.path = path
-            logger.debug("Creating edge: %s"%(fullname))
+            logger.debug("Creating edge: %s", fullname)
             #try:
             if ig_obj.current_module == "":
-                logger.warning("Failed creating mod : %s"%(fullname))
+                logger.warning("Failed creating mod : %s", fullname)
                 return
             ig_obj.create_edge(self.fullname)
             if not ig_obj.get_node(self.fullname):
@@ -61,13 +61,15 @@ def get_custom_loader(ig_obj):
 
 class ImportManager(object):
     def __init__(self):
-        print("I1")
         self.import_graph = dict()
         self.current_module = ""
         self.input_file = ""
         self.mod_dir = None
         self.old_path_hooks = None
         self.old_path = None
+        # module sources and parsed trees, keyed by filename
+        self.contents = {}
+        self.asts = {}
 
     def set_pkg(self, input_pkg):
         logger.debug("In ImportManager.set_pkg")
@@ -77,6 +79,33 @@ class ImportManager(object):
         logger.debug("In ImportManager.get_mod_dir")
         return self.mod_dir
 
+    def get_contents(self, filename):
+        logger.debug("In ImportManager.get_contents")
+        if not filename in self.contents:
+            logger.debug("Opening: %s", filename)
+            contents = ""
+            if not os.path.basename(filename).endswith(".so"):
+                with open(filename, "rt") as ff:
+                    try:
+                        contents = ff.read()
+                    except:
+                        pass
+            self.contents[filename] = contents
+        return self.contents[filename]
+
+    def get_ast(self, filename, contents):
+        logger.debug("In ImportManager.get_ast")
+        # every processor pass and the same file reached through several
+        # import paths share a single parse
+        if not filename in self.asts:
+            self.asts[filename] = ast.parse(contents, filename, type_comments=False)
+        return self.asts[filename]
+
+    def clear_caches(self):
+        # the sources and trees are only needed while the passes run
+        self.contents = {}
+        self.asts = {}
+
     def get_node(self, name):
         if name in self.import_graph:
             return self.import_graph[name]
@@ -96,7 +125,7 @@ class ImportManager(object):
         logger.debug("In ImportManager.create_edge")
         if not dest or not isinstance(dest, str):
             raise ImportManagerError("Invalid node name")
-        logger.debug("Trying to get path of %s"%(self._get_module_path()))
+        logger.debug("Trying to get path of %s", self._get_module_path())
         node = self.get_node(self._get_module_path())
         if not node:
             raise ImportManagerError("Can't add edge to a non existing node")
@@ -185,16 +214,16 @@ class ImportManager(object):
         logger.debug("In ImportManager.handle_import")
         root = name.split(".")[0]
         if root in sys.builtin_module_names:
-            logger.debug("Handling builtin modules: %s" % root)
+            logger.debug("Handling builtin modules: %s", root)
             self.create_edge(root)
             return
         logger.debug("Exit ImportManager.handle_import")
 
         # Import the module
         try:
-            logger.debug("Try import (name: %s; level: %s)" % (name, level))
+            logger.debug("Try import (name: %s; level: %s)", name, level)
             mod_name, package = self._handle_import_level(name, level)
-            logger.debug("Import success (name: %s; level: %s)" % (name, level))
+            logger.debug("Import success (name: %s; level: %s)", name, level)
         except ImportError as e:
             logger.warn(str(e))
             return
@@ -24,17 +24,29 @@ logger = logging.getLogger(__name__)
 
 
 class Pointer:
+    # Pointers are allocated for every definition, so keep them free of
+    # a per-instance __dict__. Subclasses only list their extra slots
+    __slots__ = ("values",)
+
+    # bumped whenever the values of any pointer change, so that results
+    # computed from them (e.g. the transitive closure) can be cached
+    version = 0
+
     def __init__(self):
         #logger.debug("In Pointer.__ini__")
         self.values = set()
 
     def add(self, item):
         #logger.debug("In Pointer.add")
-        self.values.add(item)
+        if not item in self.values:
+            self.values.add(item)
+            Pointer.version += 1
 
     def add_set(self, s):
         #logger.debug("In Pointer.add_set")
-        self.values.update(s)
+        if not self.values.issuperset(s):
+            self.values.update(s)
+            Pointer.version += 1
 
     def get(self):
         #logger.debug("In Pointer.get")
@@ -42,10 +54,12 @@ class Pointer:
 
     def merge(self, pointer):
         #logger.debug("In Pointer.merge")
-        self.values.update(pointer.values)
+        if not self.values.issuperset(pointer.values):
+            self.values.update(pointer.values)
+            Pointer.version += 1
 
 class LiteralPointer(Pointer):
-    __slots__ = ["values"]
+    __slots__ = ()
     STR_LIT = "STRING"
     INT_LIT = "INTEGER"
     UNK_LIT = "UNKNOWN"
@@ -62,7 +76,7 @@ class LiteralPointer(Pointer):
 
 
 class NamePointer(Pointer):
-    __slots__ = ["pos_to_name", "name_to_pos", "args", "values"]
+    __slots__ = ("pos_to_name", "name_to_pos", "args")
     def __init__(self):
         #logger.debug("In NamePointer.__init__")
         super().__init__()
@@ -56,6 +56,12 @@ class ScopeManager(object):
         if scope:
             scope.add_def(target, defi)
 
+    def handle_assign_many(self, ns, items):
+        # items is an iterable of (target, defi) pairs
+        scope = self.get_scope(ns)
+        if scope:
+            scope.add_defs(items)
+
     def get_def(self, current_ns, var_name):
         current_scope = self.get_scope(current_ns)
         while current_scope:
@@ -65,8 +71,7 @@ class ScopeManager(object):
             current_scope = current_scope.parent
 
     def get_scope(self, namespace):
-        if namespace in self.get_scopes():
-            return self.get_scopes()[namespace]
+        return self.scopes.get(namespace)
 
     def create_scope(self, namespace, parent):
         if not namespace in self.scopes:
@@ -99,9 +104,7 @@ class ScopeItem(object):
         return self.defs
 
     def get_def(self, name):
-        defs = self.get_defs()
-        if name in defs:
-            return defs[name]
+        return self.defs.get(name)
 
     def get_lambda_counter(self):
         return self.lambda_counter
@@ -132,6 +135,9 @@ class ScopeItem(object):
     def add_def(self, name, defi):
         self.defs[name] = defi
 
+    def add_defs(self, items):
+        self.defs.update(items)
+
     def merge_def(self, name, to_merge):
         if not name in self.defs:
             self.defs[name] = to_merge
@@ -29,35 +29,50 @@ from pycg.machinery.definitions import Definition
 
 node_decoder_counter = 0
 
+# numeric constants decode to their value, like strings (bools do not)
+_NUM_TYPES = (int, float, complex)
+
 logger = logging.getLogger(__name__)
 
 
 class ProcessingBase(ast.NodeVisitor):
+    # node type -> visit_ function, populated for every subclass
+    _VISITORS = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # resolve the visitors once per class instead of building
+        # "visit_" + classname and calling getattr for every node
+        visitors = {}
+        for attr in dir(cls):
+            if not attr.startswith("visit_"):
+                continue
+            fn = getattr(cls, attr)
+            # ast.NodeVisitor.visit_Constant only exists to support the
+            # deprecated visit_Num & co, which we don't use
+            if fn is getattr(ast.NodeVisitor, attr, None):
+                continue
+            node_cls = getattr(ast, attr[len("visit_"):], None)
+            if isinstance(node_cls, type) and issubclass(node_cls, ast.AST):
+                visitors[node_cls] = fn
+        cls._VISITORS = visitors
+
     def __init__(self, filename, modname, modules_analyzed):
         logger.debug(
             "In ProcessingBase.__init__: filename: %s; mod_name: %s; "
-            " analyzed modules: %s"
-            %(filename, modname, str(modules_analyzed))
+            " analyzed modules: %s",
+            filename, modname, modules_analyzed
         )
 
         self.possible_fuzz_entrypoints = []
 
-        self.modname = modname
+        self.modname = sys.intern(modname)
 
         self.modules_analyzed = modules_analyzed
         self.modules_analyzed.add(self.modname)
 
         self.filename = os.path.abspath(filename)
 
-        print("Opening: %s"%(filename))
-        if os.path.basename(filename).endswith(".so"):
-            self.contents = ""
-        else:
-            ff = open(filename, "rt")
-            try:
-                self.contents = ff.read()
-            except:
-                self.contents = ""
 
         self.name_stack = []
         self.method_stack = []
@@ -70,9 +85,18 @@ class ProcessingBase(ast.NodeVisitor):
 
     def merge_modules_analyzed(self, analyzed):
         logger.debug("In ProcessingBase.merge_modules_analyzed")
-        self.modules_analyzed.update(analyzed)
+        # processors normally share a single set, merging it into
+        # itself would just walk every analyzed module again
+        if analyzed is not self.modules_analyzed:
+            self.modules_analyzed.update(analyzed)
         logger.debug("Exit ProcessingBase.merge_modules_analyzed")
 
+    @property
+    def contents(self):
+        # every pass analyzes the same files, so the source is
+        # read once and kept by the import manager
+        return self.import_manager.get_contents(self.filename)
+
     @property
     def current_ns(self):
         #logger.debug("Called ProcessingBase.current_ns")
@@ -83,6 +107,46 @@ class ProcessingBase(ast.NodeVisitor):
         #logger.debug("Called ProcessingBase.current_method")
         return ".".join(self.method_stack)
 
+    def _fast_visit(self, node):
+        self._visit_iteratively([node])
+
+    def _fast_generic_visit(self, node):
+        self._visit_iteratively([node], children_only=True)
+
+    def visit(self, node):
+        fn = self._VISITORS.get(type(node))
+        if fn is not None:
+            return fn(self, node)
+        return self.generic_visit(node)
+
+    def _visit_iteratively(self, stack, children_only=False):
+        # Equivalent of the visit()/generic_visit() recursion using an
+        # explicit stack, so that nodes without a visitor don't cost a
+        # Python frame each.
+        visitors = self._VISITORS
+
+        while stack:
+            node = stack.pop()
+            if children_only:
+                children_only = False
+            else:
+                fn = visitors.get(type(node))
+                if fn is not None:
+                    fn(self, node)
+                    continue
+
+            children = []
+            for field in node._fields:
+                value = getattr(node, field, None)
+                if type(value) is list:
+                    for item in value:
+                        if isinstance(item, ast.AST):
+                            children.append(item)
+                elif isinstance(value, ast.AST):
+                    children.append(value)
+            children.reverse()
+            stack.extend(children)
+
     def visit_Module(self, node):
         logger.debug("In ProcessingBase.visit_Module")
         self.name_stack.append(self.modname)
@@ -240,7 +304,7 @@ class ProcessingBase(ast.NodeVisitor):
         decoded = self.decode_node(value)
 
         def do_assign(decoded, target):
-            logger.debug("In ProcessingBase._visit_assign.do_assign: Target: %s" % target)
+            logger.debug("In ProcessingBase._visit_assign.do_assign: Target: %s", target)
             self.visit(target)
             if isinstance(target, ast.Tuple):
                 for pos, elt in enumerate(target.elts):
@@ -260,6 +324,11 @@ class ProcessingBase(ast.NodeVisitor):
             do_assign(decoded, target)
         logger.debug("Exit ProcessingBase._visit_assign")
 
+    def decode_definitions(self, node):
+        # decode_node also yields literal values, which only assignments
+        # care about. Everything else wants just the definitions
+        return [d for d in self.decode_node(node) if isinstance(d, Definition)]
+
     def decode_node(self, node):
         global node_decoder_counter
         #logger.debug("Node counter: %d"%(node_decoder_counter))
@@ -271,6 +340,15 @@ class ProcessingBase(ast.NodeVisitor):
 
             node_decoder_counter -= 1
             return [self.scope_manager.get_def(self.current_ns, node.id)]
+        elif type(node) is ast.Constant:
+            # same result as the ast.Num / ast.Str branches below, without
+            # going through their deprecated isinstance hooks
+            node_decoder_counter -= 1
+            value = node.value
+            if isinstance(value, str) or (isinstance(value, _NUM_TYPES) and
+                    not isinstance(value, bool)):
+                return [value]
+            return []
         elif isinstance(node, ast.Call):
             #logger.debug("DEC-2")
             decoded = self.decode_node(node.func)
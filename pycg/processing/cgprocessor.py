@@ -19,7 +19,9 @@
 # under the License.
 #
 import os
+import sys
 import ast
+import builtins
 import logging
 
 from pycg import utils
@@ -29,6 +31,28 @@ from pycg.machinery.definitions import Definition
 
 logger = logging.getLogger(__name__)
 
+# shared default for closured lookups that miss
+_EMPTY = ()
+
+# __builtins__ is a dict or the builtins module depending on how
+# this module was loaded, so snapshot the names once
+_BUILTIN_NAMES = frozenset(dir(builtins))
+
+# prefixes/suffixes for namespaces built in visit_Call
+_BUILTIN_PREFIX = utils.constants.BUILTIN_NAME + "."
+_INIT_SUFFIX = "." + utils.constants.CLS_INIT
+
+
+def _walk_attr_chain(node):
+    # split a.b.c into the innermost node (a) and the
+    # attribute names in source order (["b", "c"])
+    attrs = []
+    while type(node) is ast.Attribute:
+        attrs.append(node.attr)
+        node = node.value
+    attrs.reverse()
+    return node, attrs
+
 
 class CallGraphProcessor(ProcessingBase):
     def __init__(self, filename, modname, import_manager,
@@ -36,8 +60,8 @@ class CallGraphProcessor(ProcessingBase):
             module_manager, call_graph=None, modules_analyzed=None):
         logger.debug(
             "In CallGraphProcessor.__init__: filename: %s; mod_name: %s; "
-            " call_graph: %s; analyzed modules: %s"
-            %(filename, modname, str(call_graph), str(modules_analyzed))
+            " call_graph: %s; analyzed modules: %s",
+            filename, modname, call_graph, modules_analyzed
         )
         super().__init__(filename, modname, modules_analyzed)
         # parent directory of file
@@ -50,22 +74,47 @@ class CallGraphProcessor(ProcessingBase):
         self.module_manager = module_manager
 
         self.call_graph = call_graph
+        # updated on nearly every statement by the counters below
+        self._cg_ext = call_graph.cg_extended
         #self.function_line_numbers = dict()
 
         self.closured = self.def_manager.transitive_closure()
 
+        # attribute chain lookups are reused per namespace. find_cls_fun_ns
+        # can still create external definitions during this pass, which
+        # may change how a chain resolves, so the caches are dropped
+        # whenever the definitions change (see _check_attr_caches)
+        self._attr_cache_version = self.def_manager.get_version()
+        self._ext_parent_cache = {}
+        self._full_attr_cache = {}
+
         logger.debug("Exit CallGraphProcessor.__init__")
 
+    generic_visit = ProcessingBase._fast_generic_visit
+
     def visit_Module(self, node):
         logger.debug("In CallGraphProcessor.visit_Module")
         self.call_graph.add_node(self.modname, self.modname)
         super().visit_Module(node)
         logger.debug("Exit CallGraphProcessor.visit_Module")
 
+    def _closured_names(self, node):
+        # union of the closures of all definitions node decodes to, so that
+        # names shared between them (e.g. aliased imports) are handled once
+        names = set()
+        closured = self.closured
+        for d in self.decode_definitions(node):
+            names.update(closured.get(d.get_ns(), _EMPTY))
+        return names
+
     def add_to_current_func(self, line_number):
-        if self.current_method not in self.call_graph.function_line_numbers:
-            self.call_graph.function_line_numbers[self.current_method] = set()
-        self.call_graph.function_line_numbers[self.current_method].add(line_number)
+        # statements and the calls inside them usually share a line,
+        # so this has to stay a set
+        line_numbers = self.call_graph.function_line_numbers
+        lines = line_numbers.get(self.current_method)
+        if lines is None:
+            lines = line_numbers[self.current_method] = set()
+        lines.add(line_number)
 
     def visit_For(self, node):
         #logger.debug("In CallGraphProcessor.visit_For line number: %d -- %s" % (node.lineno, self.current_method))
@@ -75,18 +124,17 @@ class CallGraphProcessor(ProcessingBase):
         self.visit(node.target)
         # assign target.id to the return value of __next__ of node.iter.it
         # we need to have a visit for on the postprocessor also
-        iter_decoded = self.decode_node(node.iter)
-        for item in iter_decoded:
-            if not isinstance(item, Definition):
-                continue
-            names = self.closured.get(item.get_ns(), [])
-            for name in names:
-                iter_ns = utils.join_ns(name, utils.constants.ITER_METHOD)
-                next_ns = utils.join_ns(name, utils.constants.NEXT_METHOD)
-                if self.def_manager.get(iter_ns):
-                    self.call_graph.add_edge(self.current_method, iter_ns, mod=self.modname)
-                if self.def_manager.get(next_ns):
-                    self.call_graph.add_edge(self.current_method, next_ns, mod=self.modname)
+        # closured names are never None, so the join_ns
+        # checks can be skipped for the inner loop
+        iter_suffix = "." + utils.constants.ITER_METHOD
+        next_suffix = "." + utils.constants.NEXT_METHOD
+        for name in self._closured_names(node.iter):
+            iter_ns = name + iter_suffix
+            next_ns = name + next_suffix
+            if self.def_manager.get(iter_ns):
+                self.call_graph.add_edge(self.current_method, iter_ns, mod=self.modname)
+            if self.def_manager.get(next_ns):
+                self.call_graph.add_edge(self.current_method, next_ns, mod=self.modname)
 
         super().visit_For(node)
         #logger.debug("Exit CallGraphProcessor.visit_For")
@@ -104,118 +152,80 @@ class CallGraphProcessor(ProcessingBase):
         #logger.debug("Exit CallGraphProcessor.visit_Lambda")
 
     def visit_Raise(self, node):
-        logger.debug("In CallGraphProcessor.visit_Raise line number: %d-- %s" % (node.lineno, self.current_method))
+        logger.debug("In CallGraphProcessor.visit_Raise line number: %d-- %s", node.lineno, self.current_method)
         self.add_to_current_func(node.lineno)
         if not node.exc:
             logger.debug("Exit CallGraphProcessor.visit_Raise: No node exception")
             return
+        # keep track of the exception classes raised by each function
+        exc = node.exc
+        if isinstance(exc, ast.Call) and isinstance(exc.func, ast.Name):
+            FTS = self.current_ns
+            entry = self._cg_ext.get(FTS)
+            if self.current_node_name != None and entry is not None:
+                entry['meta'].setdefault('raises', set()).add(exc.func.id)
+
         self.visit(node.exc)
-        decoded = self.decode_node(node.exc)
-        for d in decoded:
-            if not isinstance(d, Definition):
-                continue
-            names = self.closured.get(d.get_ns(), [])
-            for name in names:
-                pointer_def = self.def_manager.get(name)
-                if pointer_def.is_class_def():
-                    init_ns = self.find_cls_fun_ns(name, utils.constants.CLS_INIT)
-                    for ns in init_ns:
-                        self.call_graph.add_edge(self.current_method, ns, mod=self.modname)
-                if pointer_def.is_ext_def():
-                    self.call_graph.add_edge(self.current_method, name, mod=self.modname)
+        for name in self._closured_names(node.exc):
+            pointer_def = self.def_manager.get(name)
+            if pointer_def.is_class_def():
+                init_ns = self.find_cls_fun_ns(name, utils.constants.CLS_INIT)
+                for ns in init_ns:
+                    self.call_graph.add_edge(self.current_method, ns, mod=self.modname)
+            if pointer_def.is_ext_def():
+                self.call_graph.add_edge(self.current_method, name, mod=self.modname)
         logger.debug("Exit CallGraphProcessor.visit_Raise")
 
     def visit_AsyncFunctionDef(self, node):
-        logger.debug("In CallGraphProcessor.visit_AsyncFunctionDef: line number: %d -- %s" % (node.lineno, self.current_method))
+        logger.debug("In CallGraphProcessor.visit_AsyncFunctionDef: line number: %d -- %s", node.lineno, self.current_method)
         self.visit_FunctionDef(node)
         logger.debug("Exit CallGraphProcessor.visit_AsyncFunctionDef")
 
     def visit_FunctionDef(self, node):
-        logger.debug("In CallGraphProcessor.visit_FunctionDef: line number: %d -- %s" % (node.lineno, self.current_method))
+        logger.debug("In CallGraphProcessor.visit_FunctionDef: line number: %d -- %s", node.lineno, self.current_method)
         for decorator in node.decorator_list:
             self.visit(decorator)
-            decoded = self.decode_node(decorator)
-            for d in decoded:
-                if not isinstance(d, Definition):
-                    continue
-                names = self.closured.get(d.get_ns(), [])
-                for name in names:
-                    self.call_graph.add_edge(self.current_method, name, mod=self.modname)
-
-        self.call_graph.add_node(utils.join_ns(self.current_ns, node.name), self.modname)
-        self.call_graph.cg_extended[utils.join_ns(self.current_ns, node.name)]['meta']['lineno'] = node.lineno
-        arg_names = []
-        default_vals = []
-        arg_count = 0
-        if node.args.args != None:
-            for arg in node.args.args:
-                arg_names.append(arg.arg)
-        if node.args.vararg != None:
-            arg_names.append(node.args.vararg.arg)
-        if node.args.kwonlyargs != None:
-            for arg in node.args.kwonlyargs:
-                arg_names.append(arg.arg)
-        if node.args.kwarg != None:
-            arg_names.append(node.args.kwarg.arg)
-        if node.args.defaults != None:
-            for def_val in node.args.defaults:
-                default_vals.append(str(def_val))
-
-
-        arg_types = []
-        for arg_name in arg_names:
-            arg_types.append("N/A")
-        print("Setting callgraph to: %d"%(arg_count))
-        self.call_graph.cg_extended[utils.join_ns(self.current_ns, node.name)]['meta']['argCount'] = len(arg_names)
-        self.call_graph.cg_extended[utils.join_ns(self.current_ns, node.name)]['meta']['argNames'] = arg_names
-        self.call_graph.cg_extended[utils.join_ns(self.current_ns, node.name)]['meta']['argTypes'] = arg_types
-        self.call_graph.cg_extended[utils.join_ns(self.current_ns, node.name)]['meta']['argDefaultValues'] = default_vals
-        self.call_graph.cg_extended[utils.join_ns(self.current_ns, node.name)]['meta']['ifCount'] = 0
-        self.call_graph.cg_extended[utils.join_ns(self.current_ns, node.name)]['meta']['exprCount'] = 0
+            for name in self._closured_names(decorator):
+                self.call_graph.add_edge(self.current_method, name, mod=self.modname)
+
+        fq = utils.join_ns(self.current_ns, node.name)
+        self.call_graph.add_node(fq, self.modname)
+        meta = self._cg_ext[fq]['meta']
+        meta['lineno'] = node.lineno
+        # args, kwonlyargs and defaults are always lists,
+        # only vararg and kwarg can be None
+        args = node.args
+        arg_names = [a.arg for a in args.args]
+        if args.vararg is not None:
+            arg_names.append(args.vararg.arg)
+        arg_names.extend(a.arg for a in args.kwonlyargs)
+        if args.kwarg is not None:
+            arg_names.append(args.kwarg.arg)
+        default_vals = [str(def_val) for def_val in args.defaults]
+
+        arg_count = len(arg_names)
+        meta['argCount'] = arg_count
+        meta['argNames'] = arg_names
+        meta['argTypes'] = ["N/A"] * arg_count
+        meta['argDefaultValues'] = default_vals
+        meta['ifCount'] = 0
+        meta['exprCount'] = 0
         self.current_node_name = node.name
 
         super().visit_FunctionDef(node)
         logger.debug("Exit CallGraphProcessor.visit_FunctionDef")
 
-    def visit_Raise(self, node):
-        logger.info("In PostProcessor.visitRaise")
-        if isinstance(node.exc, ast.Name):
-            logger.info("We got a raise instruction")
-            logger.info("%s"%(str(node.exc.id)))
-        if isinstance(node.exc, ast.Call):
-            logger.info("We got a raise instruction using call")
-            logger.info("%s"%(str(node.exc)))
-            if isinstance(node.exc.func, ast.Name):
-                logger.info("The function is a name")
-                logger.info("%s"%(node.exc.func.id))
-                FTS="%s"%(str(self.current_ns))
-                if (
-                    self.current_node_name != None and
-                    FTS in self.call_graph.cg_extended
-                ):
-                    try:
-                        logger.info("Adding raise 1")
-                        self.call_graph.cg_extended[FTS]['meta']['raises'].add(node.exc.func.id)
-                        logger.info("Adding raise 2")
-                    except:
-                        logger.info("Adding raise 3")
-                        self.call_graph.cg_extended[FTS]['meta']['raises'] = set()
-                        self.call_graph.cg_extended[FTS]['meta']['raises'].add(node.exc.func.id)
-
-
     def visit_If(self, node):
         #logger.debug("In CallGraphProcessor.visit_If line number: %d -- %s" % (node.lineno, self.current_method))
         self.add_to_current_func(node.lineno)
-        FTS="%s"%(str(self.current_ns))
+        FTS = self.current_ns
 
-        if (
-            self.current_node_name != None and
-            FTS in self.call_graph.cg_extended
-        ):
-            try:
-                self.call_graph.cg_extended[FTS]['meta']['ifCount'] += 1
-            except:
-                self.call_graph.cg_extended[FTS]['meta']['ifCount'] = 1
+        # module and class level namespaces have no counters set up by
+        # visit_FunctionDef, so fall back to 0 instead of raising
+        entry = self._cg_ext.get(FTS)
+        if self.current_node_name != None and entry is not None:
+            meta = entry['meta']
+            meta['ifCount'] = meta.get('ifCount', 0) + 1
 
         self.generic_visit(node)
         #logger.debug("Exit CallGraphProcessor.visit_If")
@@ -223,29 +233,43 @@ class CallGraphProcessor(ProcessingBase):
     def visit_Expr(self, node):
         #logger.debug("In CallGraphProcessor.visit_Expr line number: %d -- %s" % (node.lineno, self.current_method))
         self.add_to_current_func(node.lineno)
-        FTS="%s"%(str(self.current_ns))
-        if FTS in self.call_graph.cg_extended:
-            try:
-                self.call_graph.cg_extended[FTS]['meta']['exprCount'] += 1
-            except:
-                self.call_graph.cg_extended[FTS]['meta']['exprCount'] = 1
+        FTS = self.current_ns
+        entry = self._cg_ext.get(FTS)
+        if entry is not None:
+            meta = entry['meta']
+            meta['exprCount'] = meta.get('exprCount', 0) + 1
         self.generic_visit(node)
     #    #super().visit_Expr(node)
         #logger.debug("Exit CallGraphProcessor.visit_Expr")
 
+    def _create_ext_edge(self, name, ext_modname, e_lineno=-1, mod=""):
+        self.add_ext_mod_node(name)
+        self.call_graph.add_node(name, ext_modname)
+        self.call_graph.add_edge(self.current_method, name, lineno=e_lineno, mod=mod, ext_mod=ext_modname)
+
     def visit_Call(self, node):
         #logger.debug("In CallGraphProcessor.visit_Call line number: %d -- %s" % (node.lineno, self.current_method))
         self.add_to_current_func(node.lineno)
-        def create_ext_edge(name, ext_modname, e_lineno=-1, mod=""):
-            #logger.debug(
-            #    "In CallGraphProcessor.visit_Call.create_ext_edge: "
-            #    "name: %s; external_mod_name: %s; external_line_no: %s; mod: %s"
-            #    % (name, ext_modname, e_lineno, mod)
-            #)
-            self.add_ext_mod_node(name)
-            self.call_graph.add_node(name, ext_modname)
-            self.call_graph.add_edge(self.current_method, name, lineno=e_lineno, mod=mod, ext_mod=ext_modname)
-            #logger.debug("Exit CallGraphProcessor.visit_Call.create_ext_edge")
+        create_ext_edge = self._create_ext_edge
+
+        # Fast path for plain `func(...)` calls: none of the atheris or
+        # attribute fail safe logic below applies, and there is no visitor
+        # for the Name itself, so resolve it straight from the scope
+        func = node.func
+        if type(func) is ast.Name:
+            for arg in node.args:
+                self.visit(arg)
+            for keyword in node.keywords:
+                self.visit(keyword.value)
+
+            defi = self.scope_manager.get_def(self.current_ns, func.id)
+            names = self.closured.get(defi.get_ns()) if defi else None
+            if names:
+                self._handle_resolved_names(names, node)
+            elif func.id in _BUILTIN_NAMES:
+                name = _BUILTIN_PREFIX + func.id
+                create_ext_edge(name, utils.constants.BUILTIN_NAME, node.lineno, self.modname)
+            return
 
         # First visit the child function so that on the case of
         #       func()()()
@@ -259,56 +283,53 @@ class CallGraphProcessor(ProcessingBase):
         self.visit(node.func)
 
         names = self.retrieve_call_names(node)
-        logger.debug("In CallGraphProcessor.visit_Call: Iterating node with line number: %d" % node.lineno)
+        logger.debug("In CallGraphProcessor.visit_Call: Iterating node with line number: %d", node.lineno)
 
         # Go through the arguments
         logger.debug("In CallGraphProcessor.visit_Call: Going through arguments")
-        try:
-            if ( isinstance(node.func, ast.Attribute) and
-                 node.func.value.id == "atheris" and
-                 node.func.attr == "Setup"
-            ):
-                # Get the target function
+        if ( type(func) is ast.Attribute and
+             func.attr == "Setup" and
+             isinstance(func.value, ast.Name) and
+             func.value.id == "atheris"
+        ):
+            # Get the target function
+            if len(node.args) >= 2 and isinstance(node.args[1], ast.Name):
                 target_func = node.args[1].id
                 self.call_graph.add_entrypoint(target_func, self.modname)
-                logger.info("Target func: %s"%(target_func))
-        except Exception as e:
-            logger.warn("In CallGraphProcessor.visit_Call: Exception: %s" % str(e))
+                logger.info("Target func: %s", target_func)
+            else:
+                logger.warning("In CallGraphProcessor.visit_Call: Unsupported atheris.Setup arguments")
 
         #logger.debug("In CallGraphProcessor.visit_Call: Main process of line number: %d" % node.lineno)
         if not names:
             #logger.debug("In CallGraphProcessor.visit_Call: No name definition found: Fail safe logic")
-            print(str(node))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("unresolved call: %s", ast.dump(node))
             if isinstance(node.func, ast.Attribute) and self.has_ext_parent(node.func):
                 #logger.debug("I-1")
                 # TODO: This doesn't work for cases where there is an assignment of an attribute
                 # i.e. import os; lala = os.path; lala.dirname()
                 for name in self.get_full_attr_names(node.func):
-                    ext_modname = name.split(".")[0]
+                    ext_modname = sys.intern(name.partition(".")[0])
                     create_ext_edge(name, ext_modname, node.lineno, self.modname)
             elif getattr(node.func, "id", None) and self.is_builtin(node.func.id):
                 #logger.debug("I-2")
-                name = utils.join_ns(utils.constants.BUILTIN_NAME, node.func.id)
+                name = _BUILTIN_PREFIX + node.func.id
                 create_ext_edge(name, utils.constants.BUILTIN_NAME, node.lineno, self.modname)
             elif isinstance(node.func, ast.Attribute):
                 #logger.debug("I-3")
-                logger.debug(ast.dump(node, indent=4))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("%s", ast.dump(node, indent=4))
                 try:
-                    lhs = ""
-                    lhs_obj = node.func
-                    while isinstance(lhs_obj, ast.Attribute):
-                        tmp = lhs_obj.value
-                        lhs = "." + lhs_obj.attr + lhs
-                        lhs_obj = tmp
-                        if isinstance(tmp, ast.Name):
-                            break
-
-                    lhs = lhs_obj.id + lhs
+                    lhs_obj, attrs = _walk_attr_chain(node.func)
+                    # fails (and is logged below) when the chain
+                    # does not start with a plain name, e.g. f().g()
+                    lhs = lhs_obj.id + "." + ".".join(attrs)
 
                     #a1 = node.func.value.id
                     # a2 = node.func.value.attr # Not sure the usage for a2, so comment it out temporary to avoid bug
                     #a3 = node.func.attr
-                    logger.debug("In CallGraphProcessor.visit_Call: Retrieved function call name: %s" %(lhs))
+                    logger.debug("In CallGraphProcessor.visit_Call: Retrieved function call name: %s", lhs)
                     # Skip selfs for now. Down the line we probably want to fix this as well, but
                     # will wait with doing this. Most likely a larger rewrite is needed once
                     # I fully grasp what we need.
@@ -317,25 +338,38 @@ class CallGraphProcessor(ProcessingBase):
 
                         create_ext_edge(lhs, utils.constants.BUILTIN_NAME, node.lineno, self.modname)
                 except Exception as e:
-                    logger.error("In CallGraphProcessor.visit_Call: Exception: %s" % str(e))
+                    logger.error("In CallGraphProcessor.visit_Call: Exception: %s", e)
             #logger.debug("I-4")
             logger.debug("Exit CallGraphProcessor.visit_Call: No name definition found: Fail safe logic")
             return
 
+        self._handle_resolved_names(names, node)
+        logger.debug("Exit CallGraphProcessor.visit_Call")
+
+    def _handle_resolved_names(self, names, node):
         self.last_called_names = names
+        # bind the lookups used for every name once
+        scopes = self.scope_manager.get_scopes()
+        # most names miss, probe the definitions dict directly
+        def_get = self.def_manager.get_defs().get
+        add_edge = self.call_graph.add_edge
+        cm = self.current_method
+        mn = self.modname
+        lineno = node.lineno
         for pointer in names:
-            pointer_init = "%s.__init__" % pointer
-            if pointer_init in self.scope_manager.get_scopes().keys():
+            pointer_init = pointer + _INIT_SUFFIX
+            if pointer_init in scopes:
                 pointer = pointer_init
-            pointer_def = self.def_manager.get(pointer)
-            if not pointer_def or not isinstance(pointer_def, Definition):
+            pointer_def = def_get(pointer)
+            # def_manager only ever stores Definition objects
+            if pointer_def is None:
                 continue
             if pointer_def.is_callable():
                 if pointer_def.is_ext_def():
-                    ext_modname = pointer.split(".")[0]
-                    create_ext_edge(pointer, ext_modname, node.lineno, self.modname)
+                    ext_modname = sys.intern(pointer.partition(".")[0])
+                    self._create_ext_edge(pointer, ext_modname, lineno, mn)
                     continue
-                self.call_graph.add_edge(self.current_method, pointer, lineno=node.lineno, mod=self.modname)
+                add_edge(cm, pointer, lineno=lineno, mod=mn)
 
                 # TODO: This doesn't work and leads to calls from the decorators
                 #    themselves to the function, creating edges to the first decorator
@@ -349,8 +383,7 @@ class CallGraphProcessor(ProcessingBase):
                 init_ns = self.find_cls_fun_ns(pointer, utils.constants.CLS_INIT)
 
                 for ns in init_ns:
-                    self.call_graph.add_edge(self.current_method, ns, lineno=node.lineno, mod=self.modname)
-        logger.debug("Exit CallGraphProcessor.visit_Call")
+                    add_edge(cm, ns, lineno=lineno, mod=mn)
 
     def analyze_submodules(self):
         logger.debug("In CallGraphProcessor.analyze_submodules")
@@ -362,7 +395,7 @@ class CallGraphProcessor(ProcessingBase):
     def analyze(self):
         logger.debug("In CallGraphProcessor.analyze")
         try:
-            self.visit(ast.parse(self.contents, self.filename))
+            self._fast_visit(self.import_manager.get_ast(self.filename, self.contents))
         except SyntaxError:
             # Handle potential syntax errors in the module. Do not
             # crash in the event a SyntaxError exists in the loaded module.
@@ -379,26 +412,49 @@ class CallGraphProcessor(ProcessingBase):
         while current_scope:
             for name, defi in current_scope.get_defs().items():
                 if defi.is_function_def() and not name in names:
-                    closured = self.closured.get(defi.get_ns())
-                    for item in closured:
-                        reachable.add(item)
+                    reachable.update(self.closured.get(defi.get_ns()))
                     names.add(name)
             current_scope = current_scope.parent
 
         logger.debug("Exit CallGraphProcessor.get_all_reachable_functions")
         return reachable
 
+    def _attr_chain_key(self, base, attrs):
+        # (namespace, dotted name) for attribute chains such as os.path.join,
+        # None when the chain does not start with a plain name
+        if type(base) is not ast.Name:
+            return None
+        return (self.current_ns, base.id + "." + ".".join(attrs))
+
+    def _check_attr_caches(self):
+        version = self.def_manager.get_version()
+        if version != self._attr_cache_version:
+            self._attr_cache_version = version
+            self._ext_parent_cache = {}
+            self._full_attr_cache = {}
+
     def has_ext_parent(self, node):
         logger.debug("In CallGraphProcessor.has_ext_parent")
         if not isinstance(node, ast.Attribute):
             logger.debug("Exit CallGraphProcessor.has_ext_parent: Not Attribute node")
             return False
 
-        while isinstance(node, ast.Attribute):
-            parents = self._retrieve_parent_names(node)
-            for parent in parents:
-                for name in self.closured.get(parent, []):
-                    defi = self.def_manager.get(name)
+        key = self._attr_chain_key(*_walk_attr_chain(node))
+        if key is None:
+            return self._has_ext_parent(node)
+        self._check_attr_caches()
+        res = self._ext_parent_cache.get(key)
+        if res is None:
+            res = self._ext_parent_cache[key] = self._has_ext_parent(node)
+        return res
+
+    def _has_ext_parent(self, node):
+        closured_get = self.closured.get
+        def_get = self.def_manager.get
+        while type(node) is ast.Attribute:
+            for parent in self._retrieve_parent_names(node):
+                for name in closured_get(parent, _EMPTY):
+                    defi = def_get(name)
                     if defi and defi.is_ext_def():
                         logger.debug("Exit CallGraphProcessor.has_ext_parent: External parent found")
                         return True
@@ -407,27 +463,31 @@ class CallGraphProcessor(ProcessingBase):
         return False
 
     def get_full_attr_names(self, node):
-        logger.debug("In CallGraphProcessor.get_full_attr_names")
-        name = ""
-        while isinstance(node, ast.Attribute):
-            if not name:
-                name = node.attr
-            else:
-                name = node.attr + "." + name
-            node = node.value
+        base, attrs = _walk_attr_chain(node)
+        key = self._attr_chain_key(base, attrs)
+        if key is None:
+            return self._get_full_attr_names(base, attrs)
+        self._check_attr_caches()
+        names = self._full_attr_cache.get(key)
+        if names is None:
+            names = self._full_attr_cache[key] = self._get_full_attr_names(base, attrs)
+        return names
 
+    def _get_full_attr_names(self, base, attrs):
+        logger.debug("In CallGraphProcessor.get_full_attr_names")
         names = []
-        if getattr(node, "id", None) == None:
+        if getattr(base, "id", None) == None:
             logger.debug("Exit CallGraphProcessor.get_full_attr_names: No ID attribute")
             return names
 
-        defi = self.scope_manager.get_def(self.current_ns, node.id)
-        if defi and self.closured.get(defi.get_ns()):
-            for id in self.closured.get(defi.get_ns()):
-                names.append(id + "." + name)
+        defi = self.scope_manager.get_def(self.current_ns, base.id)
+        if defi:
+            suffix = "." + ".".join(attrs)
+            for id in self.closured.get(defi.get_ns(), _EMPTY):
+                names.append(id + suffix)
 
         logger.debug("Exit CallGraphProcessor.get_full_attr_names")
         return names
 
     def is_builtin(self, name):
-        return name in __builtins__
+        return name in _BUILTIN_NAMES
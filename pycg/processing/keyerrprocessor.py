@@ -28,13 +28,16 @@ from pycg.processing.base import ProcessingBase
 
 logger = logging.getLogger(__name__)
 
+# names of dict literals, e.g. mod.func.<dict1>
+_DICT_RE = re.compile(r"<dict\d+>")
+
 
 class KeyErrProcessor(ProcessingBase):
     def __init__(self, filename, modname, import_manager,
             scope_manager, def_manager, class_manager, key_errs, modules_analyzed=None):
         logger.debug(
-            "In KeyErrProcessor.__init..: filename: %s; mod_name: %s; analyzed module: %s"
-            % (filename, modname, modules_analyzed)
+            "In KeyErrProcessor.__init..: filename: %s; mod_name: %s; analyzed module: %s",
+            filename, modname, modules_analyzed
         )
         super().__init__(filename, modname, modules_analyzed)
         # parent directory of file
@@ -50,6 +53,8 @@ class KeyErrProcessor(ProcessingBase):
         self.state = "keyerr"
         logger.debug("Exit KeyErrProcessor.__init__")
 
+    generic_visit = ProcessingBase._fast_generic_visit
+
     def visit_Subscript(self, node):
         logger.debug("In KeyErrProcessor.visit_Subscript")
         self.visit(node.value)
@@ -72,7 +77,8 @@ class KeyErrProcessor(ProcessingBase):
 
     def is_subscriptable(self, name):
         logger.debug("In KeyErrProcessor.is_subscriptable")
-        if re.match(r".*<dict[0-9]+>.*", name):
+        # the substring test rules out most names without running the regex
+        if "<dict" in name and _DICT_RE.search(name):
             logger.debug("Exit KeyErrProcessor.is_subscriptable")
             return True
         logger.debug("Exit KeyErrProcessor.is_subscriptable")
@@ -87,7 +93,7 @@ class KeyErrProcessor(ProcessingBase):
 
     def analyze(self):
         logger.debug("In KeyErrProcessor.analyze")
-        self.visit(ast.parse(self.contents, self.filename))
+        self._fast_visit(self.import_manager.get_ast(self.filename, self.contents))
         self.analyze_submodules()
         logger.debug("Exit KeyErrProcessor.analyze")
 
@@ -19,6 +19,7 @@
 # under the License.
 #
 import ast
+import sys
 import logging
 
 from pycg.processing.base import ProcessingBase
@@ -27,12 +28,18 @@ from pycg import utils
 
 logger = logging.getLogger(__name__)
 
+# namespace suffixes used on every call/definition, built once
+_INIT_SUFFIX = "." + utils.constants.CLS_INIT
+_RETURN_SUFFIX = "." + utils.constants.RETURN_NAME
+# <iterable>.__next__.<RET>, looked up for every name a for loop iterates
+_NEXT_RETURN_SUFFIX = "." + utils.constants.NEXT_METHOD + "." + utils.constants.RETURN_NAME
+
 
 class PostProcessor(ProcessingBase):
     def __init__(self, input_file, modname, import_manager,
             scope_manager, def_manager, class_manager, module_manager, modules_analyzed=None):
-        logger.debug("In PreProcessor.__init__: mod_name: %s; analyzed_modules: %s"
-            %(modname, str(modules_analyzed))
+        logger.debug("In PostProcessor.__init__: mod_name: %s; analyzed_modules: %s",
+            modname, modules_analyzed
         )
         super().__init__(input_file, modname, modules_analyzed)
         self.import_manager = import_manager
@@ -41,17 +48,22 @@ class PostProcessor(ProcessingBase):
         self.class_manager = class_manager
         self.module_manager = module_manager
         self.closured = self.def_manager.transitive_closure()
-        logger.debug("Exit PreProcessor.__init__")
+        # class -> state of the last parent class update (see
+        # update_parent_classes)
+        self.parent_updates = {}
+        logger.debug("Exit PostProcessor.__init__")
+
+    generic_visit = ProcessingBase._fast_generic_visit
 
     def visit_Lambda(self, node):
-        logger.debug("In PreProcessor.visit_Lambda")
+        logger.debug("In PostProcessor.visit_Lambda")
         counter = self.scope_manager.get_scope(self.current_ns).inc_lambda_counter()
         lambda_name = utils.get_lambda_name(counter)
         super().visit_Lambda(node, lambda_name)
-        logger.debug("Exit PreProcessor.visit_Lambda")
+        logger.debug("Exit PostProcessor.visit_Lambda")
 
     def visit_Call(self, node):
-        logger.debug("In PreProcessor.visit_Call")
+        logger.debug("In PostProcessor.visit_Call")
         self.visit(node.func)
 
         names = self.retrieve_call_names(node)
@@ -61,14 +73,12 @@ class PostProcessor(ProcessingBase):
             #logger.debug("- %s"%(_name))
             if "atheris.Setup" in _name:
                 logger.info("We found the call to atheris")
-                logger.info("%s"%(node.args))
-                logger.info("The second argument: %s"%(node.args[1]))
-                try:
-                  logger.info("Name: %s"%(node.args[1].id))
-                  self.possible_fuzz_entrypoints.append(node.args[1].id)
-                except:
-                  # This error can happen when arguments are passed too atheri.setup which we don't handle
-                  pass
+                logger.info("%s", node.args)
+                # Only a plain name as the second argument is handled,
+                # anything else passed to atheris.Setup is ignored
+                if len(node.args) >= 2 and isinstance(node.args[1], ast.Name):
+                    logger.info("Name: %s", node.args[1].id)
+                    self.possible_fuzz_entrypoints.append(node.args[1].id)
                 #logger.info("The parsed version: %s"%(ast.dump(node.args)))
 
         self.last_called_names = names
@@ -79,187 +89,165 @@ class PostProcessor(ProcessingBase):
                 continue
             if defi.is_class_def():
                 self.update_parent_classes(defi)
-                defi = self.def_manager.get(utils.join_ns(defi.get_ns(), utils.constants.CLS_INIT))
+                defi = self.def_manager.get(defi.get_ns() + _INIT_SUFFIX)
                 if not defi:
                     continue
             self.iterate_call_args(defi, node)
-        logger.debug("Exit PreProcessor.visit_Call")
+        logger.debug("Exit PostProcessor.visit_Call")
 
     def visit_Assign(self, node):
-        logger.debug("In PreProcessor.visit_Assign")
+        logger.debug("In PostProcessor.visit_Assign")
         self._visit_assign(node.value, node.targets)
-        logger.debug("Exit PreProcessor.visit_Assign")
+        logger.debug("Exit PostProcessor.visit_Assign")
 
     def visit_Return(self, node):
-        logger.debug("In PreProcessor.visit_Return")
+        logger.debug("In PostProcessor.visit_Return")
         self._visit_return(node)
-        logger.debug("Exit PreProcessor.visit_Return")
+        logger.debug("Exit PostProcessor.visit_Return")
 
     def visit_Yield(self, node):
-        logger.debug("In PreProcessor.visit_Yield")
+        logger.debug("In PostProcessor.visit_Yield")
         self._visit_return(node)
-        logger.debug("Exit PreProcessor.visit_Yield")
+        logger.debug("Exit PostProcessor.visit_Yield")
 
     def visit_For(self, node):
-        logger.debug("In PreProcessor.visit_For")
+        logger.debug("In PostProcessor.visit_For")
         # only handle name targets
         if isinstance(node.target, ast.Name):
             target_def = self.def_manager.get(utils.join_ns(self.current_ns, node.target.id))
             # if the target definition exists
             if target_def:
-                iter_decoded = self.decode_node(node.iter)
+                iter_decoded = self.decode_definitions(node.iter)
+                target_pointer = target_def.get_name_pointer()
+                closured_get = self.closured.get
                 # assign the target to the return value
                 # of the next function
                 for item in iter_decoded:
-                    if not isinstance(item, Definition):
-                        continue
                     # return value for generators
-                    for name in self.closured.get(item.get_ns(), []):
+                    for name in closured_get(item.get_ns(), []):
                         # If there exists a next method on the iterable
                         # and if yes, add a pointer to it
-                        next_defi = self.def_manager.get(utils.join_ns(name,
-                            utils.constants.NEXT_METHOD, utils.constants.RETURN_NAME))
+                        next_defi = self.def_manager.get(name + _NEXT_RETURN_SUFFIX)
                         if next_defi:
-                            for name in self.closured.get(next_defi.get_ns(), []):
-                                target_def.get_name_pointer().add(name)
+                            target_pointer.add_set(closured_get(next_defi.get_ns(), ()))
                         else: # otherwise, add a pointer to the name (e.g. a yield)
-                            target_def.get_name_pointer().add(name)
+                            target_pointer.add(name)
 
         super().visit_For(node)
-        logger.debug("Exit PreProcessor.visit_For")
+        logger.debug("Exit PostProcessor.visit_For")
 
     def visit_Return(self, node):
-        logger.debug("In PreProcessor.visit_Return")
+        logger.debug("In PostProcessor.visit_Return")
         self._visit_return(node)
-        logger.debug("Exit PreProcessor.visit_Return")
+        logger.debug("Exit PostProcessor.visit_Return")
 
     def visit_Yield(self, node):
-        logger.debug("In PreProcessor.visit_Yield")
+        logger.debug("In PostProcessor.visit_Yield")
         self._visit_return(node)
-        logger.debug("Exit PreProcessor.visit_Yield")
+        logger.debug("Exit PostProcessor.visit_Yield")
 
     def visit_AsyncFunctionDef(self, node):
-        logger.debug("In PreProcessor.visit_AsyncFunctionDef")
+        logger.debug("In PostProcessor.visit_AsyncFunctionDef")
         self.visit_FunctionDef(node)
-        logger.debug("Exit PreProcessor.visit_AsyncFunctionDef")
+        logger.debug("Exit PostProcessor.visit_AsyncFunctionDef")
 
     def visit_FunctionDef(self, node):
-        logger.debug("In PreProcessor.visit_FunctionDef")
+        logger.debug("In PostProcessor.visit_FunctionDef")
         # here we iterate decorators
         if node.decorator_list:
             fn_def = self.def_manager.get(utils.join_ns(self.current_ns, node.name))
-            reversed_decorators = list(reversed(node.decorator_list))
-
             # add to the name pointer of the function definition
             # the return value of the first decorator
             # since, now the function is a namespace to that point
-            if hasattr(fn_def, "decorator_names") and reversed_decorators:
-                last_decoded = self.decode_node(reversed_decorators[-1])
+            if hasattr(fn_def, "decorator_names"):
+                last_decoded = self.decode_definitions(node.decorator_list[0])
                 for d in last_decoded:
-                    if not isinstance(d, Definition):
-                        continue
-                    fn_def.decorator_names.add(utils.join_ns(d.get_ns(), utils.constants.RETURN_NAME))
+                    fn_def.decorator_names.add(sys.intern(d.get_ns() + _RETURN_SUFFIX))
 
-            previous_names = self.closured.get(fn_def.get_ns(), set())
-            for decorator in reversed_decorators:
+            closured_get = self.closured.get
+            previous_names = closured_get(fn_def.get_ns(), set())
+            for decorator in reversed(node.decorator_list):
                 # assign the previous_def as the first parameter of the decorator
-                decoded = self.decode_node(decorator)
+                decoded = self.decode_definitions(decorator)
                 new_previous_names = set()
                 for d in decoded:
-                    if not isinstance(d, Definition):
-                        continue
-                    for name in self.closured.get(d.get_ns(), []):
-                        return_ns = utils.join_ns(name, utils.constants.RETURN_NAME)
-
-                        if self.closured.get(return_ns, None) == None:
+                    # the previous names only need to be added to the
+                    # first parameter once, however many names return
+                    pending = bool(previous_names)
+                    for name in closured_get(d.get_ns(), []):
+                        return_names = closured_get(name + _RETURN_SUFFIX, None)
+                        if return_names is None:
                             continue
+                        new_previous_names.update(return_names)
 
-                        new_previous_names.update(self.closured.get(return_ns))
-
-                        for prev_name in previous_names:
-                            pos_arg_names = d.get_name_pointer().get_pos_arg(0)
-                            if not pos_arg_names:
-                                continue
-                            for name in pos_arg_names:
-                                arg_def = self.def_manager.get(name)
-                                if arg_def is not None:
-                                    arg_def.get_name_pointer().add(prev_name)
+                        if not pending:
+                            continue
+                        pending = False
+                        pos_arg_names = d.get_name_pointer().get_pos_arg(0)
+                        if not pos_arg_names:
+                            continue
+                        for arg_name in pos_arg_names:
+                            arg_def = self.def_manager.get(arg_name)
+                            if arg_def is not None:
+                                arg_def.get_name_pointer().add_set(previous_names)
                 previous_names = new_previous_names
 
         super().visit_FunctionDef(node)
-        logger.debug("Exit PreProcessor.visit_FunctionDef")
+        logger.debug("Exit PostProcessor.visit_FunctionDef")
 
     def visit_ClassDef(self, node):
-        logger.debug("In PreProcessor.visit_ClassDef")
-        logger.debug("CC-1")
+        logger.debug("In PostProcessor.visit_ClassDef")
         # create a definition for the class (node.name)
         cls_def = self.def_manager.handle_class_def(self.current_ns, node.name)
-        logger.debug("CC-2")
 
         # iterate bases to compute MRO for the class
         cls = self.class_manager.get(cls_def.get_ns())
         if not cls:
-            #logger.debug("CC-3")
             cls = self.class_manager.create(cls_def.get_ns(), self.modname)
-        #logger.debug("CC-4")
+
+        if not node.bases:
+            # nothing to inherit from, the MRO is just the class itself
+            if len(cls.get_mro()) != 1:
+                cls.clear_mro()
+            super().visit_ClassDef(node)
+            return
 
         cls.clear_mro()
-        #logger.debug("CC-5")
+        # collect every parent in order and fix the MRO once, instead
+        # of deduplicating it after each single addition
+        all_parents = []
         for base in node.bases:
-            #logger.debug("CC-6")
             # all bases are of the type ast.Name
             self.visit(base)
 
-            bases = self.decode_node(base)
-            #logger.debug("CC-7")
-            for base_def in bases:
-                #logger.debug("CC-8")
-                if not isinstance(base_def, Definition):
-                    continue
-                #logger.debug("CC-9")
-                names = set()
-                if base_def.get_name_pointer().get():
-                    #logger.debug("CC-10")
-                    names = base_def.get_name_pointer().get()
-                    #logger.debug("CC-11")
-                else:
-                    #logger.debug("CC-12")
-                    names.add(base_def.get_ns())
-                    #logger.debug("CC-13")
-                logger.debug("CC-14")
+            for base_def in self.decode_definitions(base):
+                names = base_def.get_name_pointer().get()
+                if not names:
+                    names = {base_def.get_ns()}
                 for name in names:
                     # add the base as a parent
-                    #logger.debug("CC-15")
-                    cls.add_parent(name)
-                    #logger.debug("CC-16")
+                    all_parents.append(name)
 
                     # add the base's parents
                     parent_cls = self.class_manager.get(name)
-                    #logger.debug("CC-17")
-                    if parent_cls:
-                        #logger.debug("CC-18")
-                        parent_cls_mro = parent_cls.get_mro()
-                        #logger.debug("CC-18.1")
-                        if parent_cls_mro == cls.mro:
-                            continue
-                        cls.add_parent(parent_cls_mro)
-                        #logger.debug("CC-19")
+                    # a class can't inherit its own MRO
+                    if parent_cls and parent_cls is not cls:
+                        all_parents.extend(parent_cls.get_mro())
 
-        #logger.debug("CC-20")
-        cls.compute_mro()
-        #logger.debug("CC-21")
+        if all_parents:
+            cls.add_parents(all_parents)
 
         super().visit_ClassDef(node)
-        #logger.debug("CC-22")
-        logger.debug("Exit PreProcessor.visit_ClassDef")
+        logger.debug("Exit PostProcessor.visit_ClassDef")
 
     def visit_List(self, node):
-        logger.debug("In PreProcessor.visit_List")
+        logger.debug("In PostProcessor.visit_List")
         # Works similarly with dicts
-        current_scope = self.scope_manager.get_scope(self.current_ns)
+        current_ns = self.current_ns
+        current_scope = self.scope_manager.get_scope(current_ns)
         list_counter = current_scope.inc_list_counter()
         list_name = utils.get_list_name(list_counter)
-        list_full_ns = utils.join_ns(self.current_ns, list_name)
+        list_full_ns = utils.join_ns(current_ns, list_name)
 
         # create a scope for the list
         list_scope = self.scope_manager.create_scope(list_full_ns, current_scope)
@@ -271,12 +259,13 @@ class PostProcessor(ProcessingBase):
         current_scope.add_def(list_name, list_def)
 
         self.name_stack.append(list_name)
-        for idx, elt in enumerate(node.elts):
+        # definitions for all the indices of the list
+        list_prefix = list_def.get_ns() + "."
+        key_defs = self.def_manager.get_or_create_many(
+            [sys.intern(list_prefix + utils.get_int_name(idx)) for idx in range(len(node.elts))],
+            utils.constants.NAME_DEF)
+        for elt, key_def in zip(node.elts, key_defs):
             self.visit(elt)
-            key_full_ns = utils.join_ns(list_def.get_ns(), utils.get_int_name(idx))
-            key_def = self.def_manager.get(key_full_ns)
-            if not key_def:
-                key_def = self.def_manager.create(key_full_ns, utils.constants.NAME_DEF)
 
             decoded_elt = self.decode_node(elt)
             for v in decoded_elt:
@@ -286,17 +275,18 @@ class PostProcessor(ProcessingBase):
                     key_def.get_lit_pointer().add(v)
 
         self.name_stack.pop()
-        logger.debug("Exit PreProcessor.visit_List")
+        logger.debug("Exit PostProcessor.visit_List")
 
     def visit_Dict(self, node):
-        logger.debug("In PreProcessor.visit_Dict")
+        logger.debug("In PostProcessor.visit_Dict")
         # 1. create a scope using a counter
         # 2. Iterate keys and add them as children of the scope
         # 3. Iterate values and makes a points to connection with the keys
-        current_scope = self.scope_manager.get_scope(self.current_ns)
+        current_ns = self.current_ns
+        current_scope = self.scope_manager.get_scope(current_ns)
         dict_counter = current_scope.inc_dict_counter()
         dict_name = utils.get_dict_name(dict_counter)
-        dict_full_ns = utils.join_ns(self.current_ns, dict_name)
+        dict_full_ns = utils.join_ns(current_ns, dict_name)
 
         # create a scope for the dict
         dict_scope = self.scope_manager.create_scope(dict_full_ns, current_scope)
@@ -309,13 +299,26 @@ class PostProcessor(ProcessingBase):
         current_scope.add_def(dict_name, dict_def)
 
         self.name_stack.append(dict_name)
+        dict_prefix = dict_def.get_ns() + "."
         for key, value in zip(node.keys, node.values):
             if key:
                 self.visit(key)
             if value:
                 self.visit(value)
-            decoded_key = self.decode_node(key)
+            # a None key is a **spread, which decodes to nothing
+            decoded_key = self.decode_node(key) if key is not None else []
             decoded_value = self.decode_node(value)
+            if not decoded_key:
+                continue
+
+            # split the values once, they are the same for every key
+            value_names = []
+            value_lits = []
+            for v in decoded_value:
+                if isinstance(v, Definition):
+                    value_names.append(v.get_ns())
+                else:
+                    value_lits.append(v)
 
             # iterate decoded keys and values
             # to do the assignment operation
@@ -324,71 +327,96 @@ class PostProcessor(ProcessingBase):
                     # get literal pointer
                     names = k.get_lit_pointer().get()
                 else:
-                    names = set()
                     if isinstance(k, list):
                         continue
-                    names.add(k)
+                    names = (k,)
                 for name in names:
                     # create a definition for the key
                     if isinstance(name, int):
                         name = utils.get_int_name(name)
-                    key_full_ns = utils.join_ns(dict_def.get_ns(), str(name))
+                    str_name = str(name)
+                    key_full_ns = sys.intern(dict_prefix + str_name)
                     key_def = self.def_manager.get(key_full_ns)
                     if not key_def:
                         key_def = self.def_manager.create(key_full_ns, utils.constants.NAME_DEF)
-                    dict_scope.add_def(str(name), key_def)
-                    for v in decoded_value:
-                        if isinstance(v, Definition):
-                            key_def.get_name_pointer().add(v.get_ns())
-                        else:
-                            key_def.get_lit_pointer().add(v)
+                    dict_scope.add_def(str_name, key_def)
+                    name_pointer = key_def.get_name_pointer()
+                    for v in value_names:
+                        name_pointer.add(v)
+                    lit_pointer = key_def.get_lit_pointer()
+                    for v in value_lits:
+                        lit_pointer.add(v)
         self.name_stack.pop()
-        logger.debug("Exit PreProcessor.visit_Dict")
+        logger.debug("Exit PostProcessor.visit_Dict")
 
     def update_parent_classes(self, defi):
-        logger.debug("In PreProcessor.update_parent_classes")
+        logger.debug("In PostProcessor.update_parent_classes")
         cls = self.class_manager.get(defi.get_ns())
         if not cls:
             return
         current_scope = self.scope_manager.get_scope(defi.get_ns())
+
+        # The update only adds values, so repeating it for the same
+        # definitions, MROs and class members changes nothing. This is
+        # the common case, as it runs for every instantiation
+        get_cls = self.class_manager.get
+        mros = tuple(tuple(parent_cls.get_mro()) if parent_cls else None
+                     for parent_cls in map(get_cls, cls.get_mro()))
+        state = (self.def_manager.get_version(), mros,
+                 len(current_scope.get_defs()))
+        if self.parent_updates.get(defi.get_ns()) == state:
+            return
+        self.parent_updates[defi.get_ns()] = state
+
+        # the class members are the same for every parent
+        members = [(key, child_def.get_ns())
+                   for key, child_def in current_scope.get_defs().items()
+                   if key != "__init__"]
+        if not members:
+            return
+
+        def_get = self.def_manager.get
+        def_create = self.def_manager.create
+        get_scope = self.scope_manager.get_scope
+        find_cls_fun_ns = self.find_cls_fun_ns
         for parent in cls.get_mro():
-            parent_def = self.def_manager.get(parent)
+            parent_def = def_get(parent)
             if not parent_def:
                 continue
-            parent_scope = self.scope_manager.get_scope(parent)
-            if not parent_scope:
+            if not get_scope(parent):
                 continue
-            parent_items = list(parent_scope.get_defs().keys())
-            for key, child_def in current_scope.get_defs().items():
-                if key == "__init__":
-                    continue
+            parent_ns = parent_def.get_ns()
+            parent_prefix = parent_ns + "."
+            for key, child_ns in members:
                 # resolve name from the parent_def
-                names = self.find_cls_fun_ns(parent_def.get_ns(), key)
+                names = find_cls_fun_ns(parent_ns, key)
 
-                new_ns = utils.join_ns(parent_def.get_ns(), key)
-                new_def = self.def_manager.get(new_ns)
+                new_ns = sys.intern(parent_prefix + key)
+                new_def = def_get(new_ns)
                 if not new_def:
-                    new_def = self.def_manager.create(new_ns, utils.constants.NAME_DEF)
+                    new_def = def_create(new_ns, utils.constants.NAME_DEF)
 
-                new_def.get_name_pointer().add_set(names)
-                new_def.get_name_pointer().add(child_def.get_ns())
+                pointer = new_def.get_name_pointer()
+                pointer.add_set(names)
+                pointer.add(child_ns)
 
-        logger.debug("Exit PreProcessor.update_parent_classes")
+        logger.debug("Exit PostProcessor.update_parent_classes")
 
     def analyze_submodules(self):
-        logger.debug("In PreProcessor.analyze_submodules")
+        logger.debug("In PostProcessor.analyze_submodules")
         super().analyze_submodules(PostProcessor, self.import_manager,
                 self.scope_manager, self.def_manager, self.class_manager,
                 self.module_manager, modules_analyzed=self.get_modules_analyzed())
-        logger.debug("Exit PreProcessor.analyze_submodules")
+        logger.debug("Exit PostProcessor.analyze_submodules")
 
     def analyze(self):
-        logger.debug("In PreProcessor.analyze")
+        logger.debug("In PostProcessor.analyze")
         try:
-            self.visit(ast.parse(self.contents, self.filename))
+            # parsed once and shared with the other passes
+            self._fast_visit(self.import_manager.get_ast(self.filename, self.contents))
         except SyntaxError:
             # Handle potential syntax errors in the module. Do not
             # crash in the event a SyntaxError exists in the loaded module.
             pass
         self.analyze_submodules()
-        logger.debug("Exit PreProcessor.analyze")
+        logger.debug("Exit PostProcessor.analyze")
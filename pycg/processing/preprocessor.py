@@ -22,6 +22,7 @@ import ast
 import os
 import importlib
 import logging
+import types
 
 from pycg.machinery.definitions import DefinitionManager, Definition
 from pycg import utils
@@ -29,36 +30,49 @@ from pycg.processing.base import ProcessingBase
 
 logger = logging.getLogger(__name__)
 
+_INIT_SUFFIX = "." + utils.constants.CLS_INIT
+_STATIC_METHOD = utils.constants.STATIC_METHOD
+
+# shared by all functions without defaults, so it must stay read only
+_NO_DEFAULTS = types.MappingProxyType({})
+
 
 class PreProcessor(ProcessingBase):
     def __init__(self, filename, modname,
             import_manager, scope_manager, def_manager, class_manager,
             module_manager, modules_analyzed=None):
         logger.debug(
-            "In PreProcessor.__init__: filename: %s; mod_name: %s; analyzed_modules: %s"
-            %(filename, modname, str(modules_analyzed))
+            "In PreProcessor.__init__: filename: %s; mod_name: %s; analyzed_modules: %s",
+            filename, modname, modules_analyzed
         )
         super().__init__(filename, modname, modules_analyzed)
 
-        self.modname = modname
-        self.mod_dir = "/".join(self.filename.split("/")[:-1])
+        self.mod_dir = os.path.dirname(self.filename)
 
         self.import_manager = import_manager
         self.scope_manager = scope_manager
         self.def_manager = def_manager
         self.class_manager = class_manager
         self.module_manager = module_manager
+        # imports of this module that don't need to be looked at again
+        # by the check at the end of visit_Import
+        self.checked_imports = set()
         logger.debug("Exit PreProcessor.__init__")
 
     def _get_fun_defaults(self, node):
-        logger.debug("In PreProcessor._get_fun_defaults")
+        # most functions have no defaults at all
+        if not node.args.defaults and not node.args.kw_defaults:
+            return _NO_DEFAULTS
+
         defaults = {}
         start = len(node.args.args) - len(node.args.defaults)
         for cnt, d in enumerate(node.args.defaults, start=start):
             if not d:
                 continue
 
-            self.visit(d)
+            # constants have nothing to visit, decode_node reads them as is
+            if type(d) is not ast.Constant:
+                self.visit(d)
             try:
               defaults[node.args.args[cnt].arg] = self.decode_node(d)
             except IndexError:
@@ -68,14 +82,14 @@ class PreProcessor(ProcessingBase):
         for cnt, d in enumerate(node.args.kw_defaults, start=start):
             if not d:
                 continue
-            self.visit(d)
+            if type(d) is not ast.Constant:
+                self.visit(d)
             defaults[node.args.kwonlyargs[cnt].arg] = self.decode_node(d)
 
-        logger.debug("Exit PreProcessor._get_fun_defaults")
         return defaults
 
     def analyze_submodule(self, modname):
-        logger.debug("In PreProcessor.analyze_submodule %s" % (modname))
+        logger.debug("In PreProcessor.analyze_submodule %s", modname)
         super().analyze_submodule(PreProcessor, modname,
             self.import_manager, self.scope_manager, self.def_manager, self.class_manager,
             self.module_manager, modules_analyzed=self.get_modules_analyzed())
@@ -84,27 +98,24 @@ class PreProcessor(ProcessingBase):
     def visit_Module(self, node):
         logger.debug("In PreProcessor.visit_Module")
         def iterate_mod_items(items, const):
-            logger.debug("In PreProcessor.visit_Module.iterate_mod_items")
             for item in items:
-                defi = self.def_manager.get(item)
-                if not defi:
-                    defi = self.def_manager.create(item, const)
+                defi = self.def_manager.get_or_create(item, const)
 
-                splitted = item.split(".")
-                name = splitted[-1]
-                parentns = ".".join(splitted[:-1])
+                parentns, _, name = item.rpartition(".")
                 self.scope_manager.get_scope(parentns).add_def(name, defi)
 
-            logger.debug("Exit PreProcessor.visit_Module.iterate_mod_items")
-
         self.import_manager.set_current_mod(self.modname, self.filename)
 
         mod = self.module_manager.create(self.modname, self.filename)
 
-        first = 1
-        last = len(self.contents.splitlines())
-        if last == 0:
-            first = 0
+        # count the lines without building a list of them. The file is
+        # read in text mode, so all line endings are "\n" by now
+        contents = self.contents
+        if contents:
+            first = 1
+            last = contents.count("\n") + (0 if contents.endswith("\n") else 1)
+        else:
+            first = last = 0
         mod.add_method(self.modname, first, last)
 
         root_sc = self.scope_manager.get_scope(self.modname)
@@ -114,9 +125,7 @@ class PreProcessor(ProcessingBase):
                 self.filename, self.contents)
 
             root_sc = self.scope_manager.get_scope(self.modname)
-            root_defi = self.def_manager.get(self.modname)
-            if not root_defi:
-                root_defi = self.def_manager.create(self.modname, utils.constants.MOD_DEF)
+            root_defi = self.def_manager.get_or_create(self.modname, utils.constants.MOD_DEF)
             root_sc.add_def(self.modname.split(".")[-1], root_defi)
 
             # create function and class defs and add them to their scope
@@ -126,9 +135,7 @@ class PreProcessor(ProcessingBase):
             iterate_mod_items(items["functions"], utils.constants.FUN_DEF)
             iterate_mod_items(items["classes"], utils.constants.CLS_DEF)
 
-        defi = self.def_manager.get(self.modname)
-        if not defi:
-            defi = self.def_manager.create(self.modname, utils.constants.MOD_DEF)
+        defi = self.def_manager.get_or_create(self.modname, utils.constants.MOD_DEF)
 
         super().visit_Module(node)
         logger.debug("Exit PreProcessor.visit_Module")
@@ -144,22 +151,25 @@ class PreProcessor(ProcessingBase):
         of parent directories (e.g. in this case level=1)
         """
         logger.debug("In PreProcessor.visit_Import")
-        logger.debug("%s"%(ast.dump(node, indent=4)))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s", ast.dump(node, indent=4))
         logger.debug("--------------------")
 
+        # neither changes while the imports are handled, including
+        # when submodules are analyzed in between
+        mod_dir = self.import_manager.get_mod_dir()
+        current_scope = self.scope_manager.get_scope(self.current_ns)
+
         def handle_src_name(name):
-            logger.debug("In PreProcessor.visit_Import.handle_src_name")
             # Get the module name and prepend prefix if necessary
             src_name = name
             if prefix:
                 src_name = prefix + "." + src_name
-            logger.debug("Exit PreProcessor.visit_Import.handle_src_name")
             return src_name
 
         def handle_scopes(imp_name, tgt_name, modname):
             logger.debug("In PreProcessor.visit_Import.handle_scopes")
             def create_def(scope, name, imported_def):
-                logger.debug("In PreProcessor.visit_Import.handle_scopes.create_def")
                 if not name in scope.get_defs():
                     def_ns = utils.join_ns(scope.get_ns(), name)
                     defi = self.def_manager.get(def_ns)
@@ -167,9 +177,7 @@ class PreProcessor(ProcessingBase):
                         defi = self.def_manager.assign(def_ns, imported_def)
                     defi.get_name_pointer().add(imported_def.get_ns())
                     current_scope.add_def(name, defi)
-                logger.debug("Exit PreProcessor.visit_Import.handle_scopes.create_def")
 
-            current_scope = self.scope_manager.get_scope(self.current_ns)
             imported_scope = self.scope_manager.get_scope(modname)
             if imported_scope is not None:
                 if tgt_name == "*":
@@ -191,42 +199,38 @@ class PreProcessor(ProcessingBase):
         def add_external_def(name, target):
             logger.debug("In PreProcessor.visit_Import.add_external_def")
             # add an external def for the name
-            defi = self.def_manager.get(name)
-            if not defi:
-                defi = self.def_manager.create(name, utils.constants.EXT_DEF)
-            scope = self.scope_manager.get_scope(self.current_ns)
+            defi = self.def_manager.get_or_create(name, utils.constants.EXT_DEF)
             if target != "*":
                 # add a def for the target that points to the name
-                tgt_ns = utils.join_ns(scope.get_ns(), target)
-                tgt_defi = self.def_manager.get(tgt_ns)
-                if not tgt_defi:
-                    tgt_defi = self.def_manager.create(tgt_ns, utils.constants.EXT_DEF)
+                tgt_ns = utils.join_ns(current_scope.get_ns(), target)
+                tgt_defi = self.def_manager.get_or_create(tgt_ns, utils.constants.EXT_DEF)
                 tgt_defi.get_name_pointer().add(defi.get_ns())
-                scope.add_def(target, tgt_defi)
+                current_scope.add_def(target, tgt_defi)
             logger.debug("Exit PreProcessor.visit_Import.add_external_def")
 
         for import_item in node.names:
-            logger.debug("IMP-1 %s"%(import_item.name))
+            logger.debug("IMP-1 %s", import_item.name)
             src_name = handle_src_name(import_item.name)
-            logger.debug("IMP-2 %s"%(src_name))
+            logger.debug("IMP-2 %s", src_name)
             tgt_name = import_item.asname if import_item.asname else import_item.name
-            logger.debug("IMP-3 %s"%(tgt_name))
+            logger.debug("IMP-3 %s", tgt_name)
             imported_name = self.import_manager.handle_import(src_name, level)
-            logger.debug("IMP-4 %s"%(imported_name))
+            logger.debug("IMP-4 %s", imported_name)
 
             if not imported_name:
                 add_external_def(src_name, tgt_name)
                 continue
+            self.checked_imports.add(imported_name)
 
             fname = self.import_manager.get_filepath(imported_name)
-            logger.debug("IMP-5 %s"%(fname))
+            logger.debug("IMP-5 %s", fname)
             if not fname:
                 add_external_def(src_name, tgt_name)
                 continue
 
             logger.debug("IMP-6")
             # only analyze modules under the current directory
-            if self.import_manager.get_mod_dir() in fname:
+            if mod_dir in fname:
                 logger.debug("IMP-7")
                 if not imported_name in self.modules_analyzed:
                     logger.debug("IMP-8")
@@ -237,13 +241,19 @@ class PreProcessor(ProcessingBase):
                 add_external_def(src_name, tgt_name)
             logger.debug("IMP-10")
 
-        # handle all modules that were not analyzed
+        # handle all modules that were not analyzed. Once a module has
+        # been looked at it is either analyzed or never will be, so
+        # only the imports not seen before are checked
+        checked = self.checked_imports
         for modname in self.import_manager.get_imports(self.modname):
+            if modname in checked:
+                continue
+            checked.add(modname)
             fname = self.import_manager.get_filepath(modname)
             if not fname:
                 continue
             # only analyze modules under the current directory
-            if self.import_manager.get_mod_dir() in fname and \
+            if mod_dir in fname and \
                 not modname in self.modules_analyzed:
                     self.analyze_submodule(modname)
         logger.debug("Exit PreProcessor.visit_Import")
@@ -254,19 +264,9 @@ class PreProcessor(ProcessingBase):
         logger.debug("Exit PreProcessor.visit_ImportFrom")
 
     def _get_last_line(self, node):
-        logger.debug("In PreProcessor._get_last_line")
-        lines = sorted(list(ast.walk(node)), key=lambda x: x.lineno if hasattr(x, "lineno") else 0, reverse=True)
-        if not lines:
-            logger.debug("Exit PreProcessor._get_last_line")
-            return node.lineno
-
-        last = getattr(lines[0], "lineno", node.lineno)
-        if last < node.lineno:
-            logger.debug("Exit PreProcessor._get_last_line")
-            return node.lineno
-
-        logger.debug("Exit PreProcessor._get_last_line")
-        return last
+        # definitions span up to their end_lineno, which also covers
+        # trailing multi-line expressions and strings
+        return getattr(node, "end_lineno", None) or node.lineno
 
     def _handle_function_def(self, node, fn_name):
         logger.debug("In PreProcessor._handle_function_def")
@@ -281,54 +281,52 @@ class PreProcessor(ProcessingBase):
             mod = self.module_manager.create(self.modname, self.filename)
         mod.add_method(fn_def.get_ns(), node.lineno, self._get_last_line(node))
 
-        defs_to_create = []
         name_pointer = fn_def.get_name_pointer()
 
         # TODO: static methods can be created using the staticmethod() function too
         is_static_method = False
-        if hasattr(node, "decorator_list"):
-            for decorator in node.decorator_list:
-                if isinstance(decorator, ast.Name) and decorator.id == utils.constants.STATIC_METHOD:
-                    is_static_method = True
-
-        if current_def.is_class_def() and not is_static_method and node.args.args:
-            arg_ns = utils.join_ns(fn_def.get_ns(), node.args.args[0].arg)
-            arg_def = self.def_manager.get(arg_ns)
-            if not arg_def:
-                arg_def = self.def_manager.create(arg_ns, utils.constants.NAME_DEF)
+        # lambdas have no decorator_list
+        for decorator in getattr(node, "decorator_list", ()):
+            if type(decorator) is ast.Name and decorator.id == _STATIC_METHOD:
+                is_static_method = True
+                break
+
+        positional_args = node.args.args
+        if current_def.is_class_def() and not is_static_method and positional_args:
+            arg_ns = utils.join_ns(fn_def.get_ns(), positional_args[0].arg)
+            arg_def = self.def_manager.get_or_create(arg_ns, utils.constants.NAME_DEF)
             arg_def.get_name_pointer().add(current_def.get_ns())
 
             self.scope_manager.handle_assign(fn_def.get_ns(), arg_def.get_name(), arg_def)
-            node.args.args = node.args.args[1:]
+            # the tree is shared with the later passes, so skip the
+            # first argument here instead of removing it from the node
+            positional_args = positional_args[1:]
 
-        for pos, arg in enumerate(node.args.args):
-            arg_ns = utils.join_ns(fn_def.get_ns(), arg.arg)
+        fn_ns = fn_def.get_ns()
+
+        arg_names = []
+        arg_nss = []
+        for pos, arg in enumerate(positional_args):
+            arg_ns = utils.join_ns(fn_ns, arg.arg)
             name_pointer.add_pos_arg(pos, arg.arg, arg_ns)
-            defs_to_create.append(arg_ns)
+            arg_names.append(arg.arg)
+            arg_nss.append(arg_ns)
 
         for arg in node.args.kwonlyargs:
-            arg_ns = utils.join_ns(fn_def.get_ns(), arg.arg)
+            arg_ns = utils.join_ns(fn_ns, arg.arg)
             # TODO: add_name_arg function
             name_pointer.add_name_arg(arg.arg, arg_ns)
-            defs_to_create.append(arg_ns)
+            arg_names.append(arg.arg)
+            arg_nss.append(arg_ns)
 
-        # TODO: Add support for kwargs and varargs
-        #if node.args.kwarg:
-        #    pass
-        #if node.args.vararg:
-        #    pass
-
-        for arg_ns in defs_to_create:
-            arg_def = self.def_manager.get(arg_ns)
-            if not arg_def:
-                arg_def = self.def_manager.create(arg_ns, utils.constants.NAME_DEF)
+        arg_defs = self.def_manager.get_or_create_many(arg_nss, utils.constants.NAME_DEF)
+        self.scope_manager.handle_assign_many(fn_ns,
+                [(arg_def.get_name(), arg_def) for arg_def in arg_defs])
 
-            self.scope_manager.handle_assign(fn_def.get_ns(), arg_def.get_name(), arg_def)
-
-            # has a default
-            arg_name = arg_ns.split(".")[-1]
-            if defaults.get(arg_name, None):
-                for default in defaults[arg_name]:
+        # has a default
+        if defaults:
+            for arg_name, arg_def in zip(arg_names, arg_defs):
+                for default in defaults.get(arg_name) or ():
                     if isinstance(default, Definition):
                         arg_def.get_name_pointer().add(default.get_ns())
                         if default.is_function_def():
@@ -337,6 +335,12 @@ class PreProcessor(ProcessingBase):
                             arg_def.merge(default)
                     else:
                         arg_def.get_lit_pointer().add(default)
+
+        # TODO: Add support for kwargs and varargs
+        #if node.args.kwarg:
+        #    pass
+        #if node.args.vararg:
+        #    pass
         logger.debug("Exit PreProcessor._handle_function_def")
         return fn_def
 
@@ -380,21 +384,22 @@ class PreProcessor(ProcessingBase):
 
     def visit_Call(self, node):
         logger.debug("In PreProcessor.visit_Call")
-        self.visit(node.func)
+        func = node.func
         # if it is not a name there's nothing we can do here
         # ModuleVisitor will be able to resolve those calls
         # since it'll have the name tracking information
-        if not isinstance(node.func, ast.Name):
+        if not isinstance(func, ast.Name):
+            self.visit(func)
             return
+        # there is no visitor for plain names (or their context),
+        # so there is nothing to visit in func
 
-        fullns = utils.join_ns(self.current_ns, node.func.id)
-
-        defi = self.scope_manager.get_def(self.current_ns, node.func.id)
+        defi = self.scope_manager.get_def(self.current_ns, func.id)
         if not defi:
             return
 
         if defi.is_class_def():
-            defi = self.def_manager.get(utils.join_ns(defi.get_ns(), utils.constants.CLS_INIT))
+            defi = self.def_manager.get(defi.get_ns() + _INIT_SUFFIX)
             if not defi:
                 return
 
@@ -450,11 +455,12 @@ class PreProcessor(ProcessingBase):
             self.import_manager.set_filepath(self.modname, self.filename)
 
         try:
-            self.visit(ast.parse(self.contents, self.filename))
+            # parsed once and shared with the later passes
+            self.visit(self.import_manager.get_ast(self.filename, self.contents))
         except SyntaxError:
             # In the event for some reason there is a Syntax error we avoid
             # failing completely.
-            logger.info("SyntaxError happened for %s" % (self.filename))
+            logger.info("SyntaxError happened for %s", self.filename)
             pass
 
         logger.debug("Exit PreProcessor.analyze")
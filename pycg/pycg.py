@@ -134,19 +134,19 @@ class CallGraphGenerator(object):
             input_pkg = self.package
             input_mod = self._get_mod_name(entry_point, input_pkg)
             input_file = os.path.abspath(entry_point)
-            logger.debug("E1 -- %s -- %s -- %s"%(input_pkg, input_mod, input_file))
+            logger.debug("E1 -- %s -- %s -- %s", input_pkg, input_mod, input_file)
             if not input_mod:
                 continue
 
-            logger.debug("E2 -- %s -- %s -- %s"%(input_pkg, input_mod, input_file))
+            logger.debug("E2 -- %s -- %s -- %s", input_pkg, input_mod, input_file)
             if not input_pkg:
                 input_pkg = os.path.dirname(input_file)
 
-            logger.debug("E3 -- %s -- %s -- %s"%(input_pkg, input_mod, input_file))
+            logger.debug("E3 -- %s -- %s -- %s", input_pkg, input_mod, input_file)
             if not input_mod in modules_analyzed:
-                logger.info("Running analysis on: %s"%(input_file))
-                logger.info("Input mod: %s"%(input_mod))
-                logger.info("Input pkg: %s"%(input_pkg))
+                logger.info("Running analysis on: %s", input_file)
+                logger.info("Input mod: %s", input_mod)
+                logger.info("Input pkg: %s", input_pkg)
                 if install_hooks:
                     logger.info("Installing hooks")
                     self.import_manager.set_pkg(input_pkg)
@@ -156,13 +156,17 @@ class CallGraphGenerator(object):
                 logger.info("Creating processing class")
                 processor = cls(input_file, input_mod,
                                 modules_analyzed=modules_analyzed, *args, **kwargs)
-                logger.info("Done analysis: %s"%(input_file))
+                logger.info("Done analysis: %s", input_file)
                 processor.analyze()
-                modules_analyzed.update(processor.get_modules_analyzed())
+                # the processor adds to modules_analyzed in place unless
+                # it was given its own set
+                analyzed = processor.get_modules_analyzed()
+                if analyzed is not modules_analyzed:
+                    modules_analyzed.update(analyzed)
 
                 if install_hooks:
                     self.remove_import_hooks()
-            logger.debug("E5 -- %s -- %s -- %s #"%(input_pkg, input_mod, input_file))
+            logger.debug("E5 -- %s -- %s -- %s #", input_pkg, input_mod, input_file)
 
     def analyze(self):
         #try:
@@ -186,7 +190,7 @@ class CallGraphGenerator(object):
 
         iter_cnt = 0
         while (self.max_iter < 0 or iter_cnt < self.max_iter) and (not self.has_converged()):
-            logger.debug("Iteration %d"%(iter_cnt))
+            logger.debug("Iteration %d", iter_cnt)
             self.state = self.extract_state()
             self.reset_counters()
             self.do_pass(PostProcessor, False,
@@ -208,6 +212,8 @@ class CallGraphGenerator(object):
         else:
             raise Exception("Invalid operation: " + self.operation)
 
+        self.import_manager.clear_caches()
+
 
     def output(self):
         return self.cg.get()
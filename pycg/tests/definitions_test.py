@@ -18,6 +18,8 @@
 # specific language governing permissions and limitations
 # under the License.
 #
+import sys
+
 from base import TestBase
 from pycg.machinery.definitions import Definition, DefinitionManager, DefinitionError
 from pycg.machinery.pointers import LiteralPointer
@@ -48,6 +50,30 @@ class DefinitionManagerTest(TestBase):
         with self.assertRaises(DefinitionError):
             dm.create("adefi2", "notavalidtype")
 
+    def test_get_or_create(self):
+        dm = DefinitionManager()
+        existing = dm.create("adefi", utils.constants.FUN_DEF)
+        self.assertEqual(dm.get_or_create("adefi", utils.constants.NAME_DEF), existing)
+
+        created = dm.get_or_create("adefi2", utils.constants.NAME_DEF)
+        self.assertEqual(dm.get("adefi2"), created)
+        self.assertEqual(created.get_type(), utils.constants.NAME_DEF)
+
+    def test_get_or_create_many(self):
+        dm = DefinitionManager()
+        existing = dm.create("list.0", utils.constants.FUN_DEF)
+
+        defs = dm.get_or_create_many(["list.0", "list.1"], utils.constants.NAME_DEF)
+        # existing definitions are returned as is
+        self.assertEqual(defs[0], existing)
+        self.assertEqual(defs[0].get_type(), utils.constants.FUN_DEF)
+        # missing ones are created
+        self.assertEqual(defs[1], dm.get("list.1"))
+        self.assertEqual(defs[1].get_type(), utils.constants.NAME_DEF)
+
+        with self.assertRaises(DefinitionError):
+            dm.get_or_create_many(["list.2"], "notavalidtype")
+
     def test_assign(self):
         dm = DefinitionManager()
         defi1 = dm.create("defi1", utils.constants.NAME_DEF)
@@ -85,3 +111,49 @@ class DefinitionManagerTest(TestBase):
         # a definition for the function should be created
         fn_def = dm.get(fn_ns)
         self.assertIsNotNone(fn_def)
+
+    def test_transitive_closure(self):
+        dm = DefinitionManager()
+        a = dm.create("a", utils.constants.NAME_DEF)
+        dm.create("b", utils.constants.FUN_DEF)
+
+        a.get_name_pointer().add("b")
+        closured = dm.transitive_closure()
+        self.assertEqual(closured["a"], set(["b"]))
+        self.assertEqual(closured["b"], set(["b"]))
+
+        # nothing changed, the cached closure is returned
+        self.assertIs(dm.transitive_closure(), closured)
+
+        # adding a value that is already there does not invalidate it
+        a.get_name_pointer().add("b")
+        self.assertIs(dm.transitive_closure(), closured)
+
+        # new pointer values and new definitions do
+        dm.create("c", utils.constants.FUN_DEF)
+        a.get_name_pointer().add("c")
+        closured = dm.transitive_closure()
+        self.assertEqual(closured["a"], set(["b", "c"]))
+
+        dm.create("d", utils.constants.FUN_DEF)
+        self.assertIn("d", dm.transitive_closure())
+
+    def test_closure_of_long_chain(self):
+        # chains longer than the recursion limit should not fail
+        dm = DefinitionManager()
+        length = sys.getrecursionlimit() * 2
+        for i in range(length):
+            defi = dm.create("n{}".format(i), utils.constants.NAME_DEF)
+            defi.get_name_pointer().add("n{}".format(i + 1))
+        dm.create("n{}".format(length), utils.constants.FUN_DEF)
+
+        closured = dm.transitive_closure()
+        self.assertEqual(closured["n0"], set(["n{}".format(length)]))
+
+        # cycles resolve to the names on the cycle
+        dm = DefinitionManager()
+        a = dm.create("a", utils.constants.NAME_DEF)
+        b = dm.create("b", utils.constants.NAME_DEF)
+        a.get_name_pointer().add("b")
+        b.get_name_pointer().add("a")
+        self.assertEqual(dm.transitive_closure()["a"], set(["a"]))
@@ -22,6 +22,7 @@ import sys
 import copy
 import mock
 import os
+import tempfile
 
 from base import TestBase
 from pycg.machinery.imports import ImportManager, ImportManagerError, get_custom_loader
@@ -48,6 +49,43 @@ class ImportsTest(TestBase):
         with self.assertRaises(ImportManagerError):
             im.create_node(1)
 
+    def test_get_contents(self):
+        im = ImportManager()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "mod1.py")
+            with open(fname, "w") as f:
+                f.write("x = 1")
+            self.assertEqual(im.get_contents(fname), "x = 1")
+
+            # the file is only read once
+            with open(fname, "w") as f:
+                f.write("x = 2")
+            self.assertEqual(im.get_contents(fname), "x = 1")
+
+            # cleared sources are read again on the next request
+            im.clear_caches()
+            self.assertEqual(im.get_contents(fname), "x = 2")
+
+        # shared objects are not read
+        self.assertEqual(im.get_contents("mod2.so"), "")
+
+    def test_get_ast(self):
+        im = ImportManager()
+
+        tree = im.get_ast("mod1.py", "x = 1")
+        self.assertEqual(tree.body[0].targets[0].id, "x")
+
+        # a file is only parsed once
+        self.assertIs(im.get_ast("mod1.py", "x = 1"), tree)
+        self.assertIsNot(im.get_ast("mod2.py", "x = 1"), tree)
+
+        with self.assertRaises(SyntaxError):
+            im.get_ast("mod3.py", "x = ")
+
+        # cleared trees are parsed again on the next request
+        im.clear_caches()
+        self.assertIsNot(im.get_ast("mod1.py", "x = 1"), tree)
+
     def test_set_filepath(self):
         fpath = "input_file.py"
         im = ImportManager()
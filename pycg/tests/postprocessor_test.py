@@ -0,0 +1,81 @@
+#
+# Copyright (c) 2020 Vitalis Salis.
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import os
+import tempfile
+
+from base import TestBase
+from pycg import utils
+from pycg.pycg import CallGraphGenerator
+
+ENCODER = """
+class Encoder:
+    def __init__(self, default=None):
+        if default is not None:
+            self.default = default
+
+    def default(self, o):
+        raise TypeError(o)
+
+    def encode(self, o):
+        return self.iterencode(o)
+
+    def iterencode(self, o):
+        _iterencode = _make_iterencode(self.default)
+        return _iterencode(o)
+
+
+def _make_iterencode(_default):
+    def _iterencode(o):
+        return _default(o)
+    return _iterencode
+"""
+
+MAIN = """
+from encoder import Encoder
+
+_default_encoder = Encoder()
+
+def dumps(obj, cls=None, default=None):
+    if cls is None and default is None:
+        return _default_encoder.encode(obj)
+    if cls is None:
+        cls = Encoder
+    return cls(default=default).encode(obj)
+"""
+
+class PostProcessorTest(TestBase):
+    def test_aliased_method_arg(self):
+        # the bound method passed as an argument must not be lost,
+        # no matter in which order the closures are looked up
+        with tempfile.TemporaryDirectory() as tmpdir:
+            entry_points = []
+            for name, contents in (("encoder", ENCODER), ("main", MAIN)):
+                fname = os.path.join(tmpdir, name + ".py")
+                with open(fname, "w") as f:
+                    f.write(contents)
+                entry_points.append(fname)
+
+            cg = CallGraphGenerator(entry_points, tmpdir, -1, utils.constants.CALL_GRAPH_OP)
+            cg.analyze()
+
+            defi = cg.def_manager.get("encoder._make_iterencode._default")
+            self.assertEqual(defi.get_name_pointer().get(),
+                set(["encoder.Encoder.default", "main.dumps.default"]))
@@ -0,0 +1,54 @@
+#
+# Copyright (c) 2020 Vitalis Salis.
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import os
+import tempfile
+
+from base import TestBase
+from pycg.machinery.imports import ImportManager
+from pycg.machinery.scopes import ScopeManager
+from pycg.machinery.definitions import DefinitionManager
+from pycg.machinery.classes import ClassManager
+from pycg.machinery.modules import ModuleManager
+from pycg.processing.preprocessor import PreProcessor
+
+class PreProcessorTest(TestBase):
+    def test_method_args(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "mod.py")
+            with open(fname, "w") as f:
+                f.write("class A:\n    def meth(self, x):\n        pass\n")
+
+            im = ImportManager()
+            im.set_pkg(tmpdir)
+            dm = DefinitionManager()
+            PreProcessor(fname, "mod", im, ScopeManager(), dm,
+                ClassManager(), ModuleManager(), modules_analyzed=set()).analyze()
+
+            # self points to the class and is not a positional argument
+            self.assertEqual(dm.get("mod.A.meth.self").get_name_pointer().get(), {"mod.A"})
+            pos_args = dm.get("mod.A.meth").get_name_pointer().get_pos_args()
+            self.assertEqual(pos_args, {0: {"mod.A.meth.x"}})
+
+            # the tree is shared with the later passes, so the
+            # arguments of the method must be left untouched
+            tree = im.get_ast(os.path.abspath(fname), im.get_contents(os.path.abspath(fname)))
+            meth = tree.body[0].body[0]
+            self.assertEqual([a.arg for a in meth.args.args], ["self", "x"])
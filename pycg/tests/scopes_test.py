@@ -85,6 +85,18 @@ class ScopeManagerTest(TestBase):
         sm.handle_assign("root", "name", "value")
         self.assertEqual(sm.get_def("root", "name"), "value")
 
+    def test_handle_assign_many(self):
+        sm = ScopeManager()
+
+        sm.scopes["root"] = ScopeItem("root", None)
+        sm.handle_assign_many("root", [("name1", "value1"), ("name2", "value2")])
+        self.assertEqual(sm.get_def("root", "name1"), "value1")
+        self.assertEqual(sm.get_def("root", "name2"), "value2")
+
+        # unknown scopes are ignored
+        sm.handle_assign_many("unknown", [("name3", "value3")])
+        self.assertEqual(sm.get_def("root", "name3"), None)
+
 
     def test_get_def(self):
         sm = ScopeManager()
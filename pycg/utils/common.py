@@ -19,16 +19,24 @@
 # under the License.
 #
 import os
+import sys
+from functools import lru_cache
 
+# The same few counters come up for every module, so the names are
+# cached. typed=True keeps e.g. True and 1 apart, they format differently
+@lru_cache(maxsize=1024, typed=True)
 def get_lambda_name(counter):
     return "<lambda{}>".format(counter)
 
+@lru_cache(maxsize=1024, typed=True)
 def get_dict_name(counter):
     return "<dict{}>".format(counter)
 
+@lru_cache(maxsize=1024, typed=True)
 def get_list_name(counter):
     return "<list{}>".format(counter)
 
+@lru_cache(maxsize=1024, typed=True)
 def get_int_name(counter):
     return "<int{}>".format(counter)
 
@@ -36,7 +44,9 @@ def join_ns(*args):
     for arg in args:
         if arg == None:
             return
-    return ".".join([arg for arg in args])
+    # namespaces are used as dictionary keys all over the place,
+    # interning them lets equal keys compare by identity
+    return sys.intern(".".join(args))
 
 def to_mod_name(name, package=None):
-    return os.path.splitext(name)[0].replace("/", ".")
+    return os.path.splitext(name)[0].replace(os.sep, ".")